@@ -1,7 +1,13 @@
-from sqlmodel import SQLModel, create_engine, Session, select
+import logging
+from pathlib import Path
+from sqlmodel import create_engine, Session
 from backend.config import settings
 from typing import Generator
 
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
 # Create database engine
 engine = create_engine(
     settings.database_url,
@@ -12,10 +18,27 @@ engine = create_engine(
 
 
 def create_db_and_tables():
-    """Create database tables."""
-    print("Creating database tables...")
-    print(engine.url)
-    SQLModel.metadata.create_all(engine)
+    """Bring the schema to the latest migration, creating it on an empty database."""
+    if settings.db_migrate_on_startup:
+        logger.info("Migrating database on %s", engine.url.render_as_string(hide_password=True))
+        run_migrations()
+    else:
+        logger.info("DB_MIGRATE_ON_STARTUP is off; run `make migrate` to apply migrations")
+
+
+def _alembic_config():
+    from alembic.config import Config
+
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    return config
+
+
+def run_migrations():
+    """Upgrade the schema to the latest Alembic revision."""
+    from alembic import command
+
+    command.upgrade(_alembic_config(), "head")
 
 
 def get_session() -> Generator[Session, None, None]:
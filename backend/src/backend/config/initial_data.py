@@ -1,8 +1,11 @@
+import logging
 from sqlmodel import select
 from .database import get_session
 from backend.utils.auth import hash_password
 from backend.models.models import Setting, User
 
+logger = logging.getLogger(__name__)
+
 
 def create_initial_data():
     session = next(get_session())
@@ -25,16 +28,16 @@ def create_initial_data():
         existing_user = session.exec(select(User).where(User.username == user.username)).first()
         if not existing_user:
             session.add(user)
-            print(f"Created initial user: {user.username}")
+            logger.info("Created initial user: %s", user.username)
         else:
-            print(f"User {user.username} already exists")
+            logger.debug("User %s already exists", user.username)
 
     for setting in initial_settings:
         existing_setting = session.exec(select(Setting).where(Setting.key == setting.key)).first()
         if not existing_setting:
             session.add(setting)
-            print(f"Created initial setting: {setting.key} = {setting.value}")
+            logger.info("Created initial setting: %s", setting.key)
         else:
-            print(f"Setting {setting.key} already exists")
+            logger.debug("Setting %s already exists", setting.key)
 
     session.commit()
@@ -1,18 +1,30 @@
 import io
+import logging
 import os
+import uuid
+from datetime import datetime
 from PIL.Image import Image
-from typing import Optional
+from typing import Iterator, List, Optional, Tuple
 from minio import Minio
+from minio.deleteobjects import DeleteObject
 
 from .settings import settings
 
 minio_client: Optional[Minio] = None
 
+logger = logging.getLogger(__name__)
+
+def image_id_from_object_name(name: str) -> Optional[uuid.UUID]:
+    """Objects are stored as <image uuid>_<variant>.png."""
+    try:
+        return uuid.UUID(name.split("_", 1)[0])
+    except ValueError:
+        return None
+
+
 def create_minio_client() -> Minio:
     global minio_client
 
-    print("MinIO settings:", settings.minio_host, settings.minio_root_user, settings.minio_bucket)
-
     if minio_client is None:
         minio_client = Minio(
             endpoint=settings.minio_host,
@@ -45,4 +57,21 @@ def get_file_bytes_from_minio(path: str) -> bytes:
     client = create_minio_client()
     bucket_name = settings.minio_bucket
     response = client.get_object(bucket_name, path)
-    return response.read()
\ No newline at end of file
+    return response.read()
+
+
+def delete_from_minio(paths: List[str]) -> None:
+    """Delete objects in one batched request; missing objects are ignored."""
+    client = create_minio_client()
+    bucket_name = settings.minio_bucket
+    errors = client.remove_objects(bucket_name, [DeleteObject(path) for path in paths])
+    # remove_objects is lazy; iterating the errors performs the deletes
+    for error in errors:
+        logger.warning("MinIO delete failed for %s: %s", error.name, error.message)
+
+
+def list_minio_objects() -> Iterator[Tuple[str, Optional[datetime]]]:
+    """Yield (object name, last modified) for every object in the bucket."""
+    client = create_minio_client()
+    for obj in client.list_objects(settings.minio_bucket, recursive=True):
+        yield obj.object_name, obj.last_modified
@@ -0,0 +1,530 @@
+import fcntl
+import json
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from qdrant_client.models import (
+    FieldCondition,
+    Filter,
+    HasIdCondition,
+    MatchAny,
+    MatchExcept,
+    MatchValue,
+    PointStruct,
+    ScoredPoint,
+)
+
+from .vector_store import VectorStore
+
+
+def _as_list(conditions) -> list:
+    if conditions is None:
+        return []
+    return conditions if isinstance(conditions, list) else [conditions]
+
+
+class _ReadWriteLock:
+    """Many readers or one writer; a waiting writer holds off new readers."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._readers = 0
+        self._writer = False
+        self._writers_waiting = 0
+
+    @contextmanager
+    def reading(self):
+        with self._cond:
+            while self._writer or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def writing(self):
+        with self._cond:
+            self._writers_waiting += 1
+            while self._writer or self._readers:
+                self._cond.wait()
+            self._writers_waiting -= 1
+            self._writer = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer = False
+                self._cond.notify_all()
+
+
+class NumpyVectorStore(VectorStore):
+    """
+    Embedded vector index for small installs and test environments.
+
+    Normalized float32 vectors live in a memory-mapped matrix (vectors.f32).
+    Ids and payloads live in a snapshot (index.json) plus an append-only log
+    of changes since it (index.log, one JSON object per line), so a write
+    costs one log line; the log is folded into a new snapshot once it grows
+    past a fraction of the index. Search is one matrix-vector product plus
+    argpartition, with filters applied as boolean masks. Deletes tombstone a
+    row and the matrix is compacted once the dead fraction exceeds
+    `compact_ratio`.
+
+    Several processes (the server and src/backfill.py) may share a directory:
+    writes hold an exclusive fcntl lock on it, reads a shared one, and each
+    instance replays new log lines (or reloads after a snapshot) first.
+    Within a process a reader/writer lock does the same, so searches from
+    different threads run concurrently.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dim: int = 768,
+        compact_ratio: float = 0.2,
+        snapshot_ratio: float = 0.25,
+        min_snapshot_entries: int = 1000,
+    ):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.dim = dim
+        self.compact_ratio = compact_ratio
+        self.snapshot_ratio = snapshot_ratio
+        self.min_snapshot_entries = min_snapshot_entries
+        self._matrix_path = self.path / "vectors.f32"
+        self._meta_path = self.path / "index.json"
+        self._log_path = self.path / "index.log"
+        self._lock = _ReadWriteLock()
+        self._lock_file = open(self.path / ".lock", "a+")
+        # Threads reading at once share one shared flock on _lock_file
+        self._flock_mutex = threading.Lock()
+        self._flock_readers = 0
+
+        self._ids: List[Optional[str]] = []  # row -> point id, None if deleted
+        self._payloads: List[dict] = []
+        self._rows: Dict[str, int] = {}
+        self._alive = np.zeros(0, dtype=bool)
+        self._columns: Dict[str, np.ndarray] = {}
+        self._matrix: Optional[np.memmap] = None
+
+        # What this instance has read: the snapshot's identity and generation,
+        # and how far into the log (None until a log of that generation exists)
+        self._snapshot_stat: Optional[tuple] = None
+        self._generation = 0
+        self._log_ino: Optional[int] = None
+        self._log_offset: Optional[int] = None
+        self._log_entries = 0
+        # (inode, size) of the log when we last read it, torn tail included
+        self._log_seen: Optional[tuple] = None
+
+        with self._locked(exclusive=True):
+            pass
+
+    # Storage
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        """Hold the thread lock and the directory lock, with state refreshed."""
+        if exclusive:
+            with self._lock.writing():
+                fcntl.flock(self._lock_file, fcntl.LOCK_EX)
+                try:
+                    self._refresh()
+                    yield
+                finally:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            return
+        while True:
+            with self._lock.reading(), self._shared_flock():
+                # Nothing can write while these are held, so if we are up to
+                # date now we stay so for the whole read
+                if self._pending()[0] is None:
+                    yield
+                    return
+            # Another process wrote since our last look; catch up alone
+            with self._lock.writing():
+                fcntl.flock(self._lock_file, fcntl.LOCK_SH)
+                try:
+                    self._refresh()
+                finally:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    @contextmanager
+    def _shared_flock(self):
+        with self._flock_mutex:
+            if not self._flock_readers:
+                fcntl.flock(self._lock_file, fcntl.LOCK_SH)
+            self._flock_readers += 1
+        try:
+            yield
+        finally:
+            with self._flock_mutex:
+                self._flock_readers -= 1
+                if not self._flock_readers:
+                    fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _stat(path: Path) -> Optional[os.stat_result]:
+        try:
+            return os.stat(path)
+        except FileNotFoundError:
+            return None
+
+    def _pending(self) -> Tuple[Optional[str], Optional[tuple]]:
+        """What catching up with other instances takes: "reload", "replay" or
+        None, plus the snapshot's identity."""
+        snapshot = self._stat(self._meta_path)
+        snapshot_stat = snapshot and (snapshot.st_ino, snapshot.st_mtime_ns, snapshot.st_size)
+        log = self._stat(self._log_path)
+        if self._matrix is None or snapshot_stat != self._snapshot_stat or (
+            log is not None and self._log_offset is not None and log.st_ino != self._log_ino
+        ):
+            return "reload", snapshot_stat
+        if log is not None and (log.st_ino, log.st_size) != self._log_seen:
+            return "replay", snapshot_stat
+        return None, snapshot_stat
+
+    def _refresh(self) -> None:
+        """Catch up with writes made by other instances since our last look."""
+        action, snapshot_stat = self._pending()
+        if action == "reload":
+            self._reload(snapshot_stat)
+        elif action == "replay":
+            self._replay_log()
+
+    def _reload(self, snapshot_stat: Optional[tuple]) -> None:
+        self._ids, self._payloads, self._generation = [], [], 0
+        if self._meta_path.exists():
+            meta = json.loads(self._meta_path.read_text())
+            if meta["dim"] != self.dim:
+                raise ValueError(f"Index at {self.path} has dim {meta['dim']}, expected {self.dim}")
+            self._ids = meta["ids"]
+            self._payloads = meta["payloads"]
+            self._generation = meta.get("generation", 0)
+        self._snapshot_stat = snapshot_stat
+        self._rows = {point_id: row for row, point_id in enumerate(self._ids) if point_id is not None}
+        self._alive = np.zeros(0, dtype=bool)
+        self._matrix = None
+        self._ensure_capacity(max(len(self._ids), 1024))
+        self._alive[: len(self._ids)] = [point_id is not None for point_id in self._ids]
+        self._columns.clear()
+        self._log_ino, self._log_offset, self._log_entries = None, None, 0
+        self._log_seen = None
+        self._replay_log()
+
+    def _replay_log(self) -> None:
+        """Apply complete log lines past our offset; a torn last line is left alone."""
+        try:
+            f = open(self._log_path, "rb")
+        except FileNotFoundError:
+            return
+        with f:
+            stat = os.fstat(f.fileno())
+            self._log_seen = (stat.st_ino, stat.st_size)
+            if self._log_offset is None:
+                header = f.readline()
+                if not header.endswith(b"\n") or json.loads(header).get("generation") != self._generation:
+                    # Left over from before the current snapshot; its changes are in it
+                    return
+                self._log_ino = os.fstat(f.fileno()).st_ino
+                self._log_offset = len(header)
+            f.seek(self._log_offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                self._apply(json.loads(line))
+                self._log_offset += len(line)
+                self._log_entries += 1
+
+    def _apply(self, entry: dict) -> None:
+        op, point_id = entry["op"], entry["id"]
+        if op == "put":
+            row = entry["row"]
+            self._ensure_capacity(row + 1)
+            while len(self._ids) <= row:
+                self._ids.append(None)
+                self._payloads.append({})
+            self._ids[row] = point_id
+            self._payloads[row] = entry["payload"]
+            self._rows[point_id] = row
+            self._alive[row] = True
+        elif op == "payload":
+            row = self._rows.get(point_id)
+            if row is not None:
+                self._payloads[row] = entry["payload"]
+        elif op == "delete":
+            row = self._rows.pop(point_id, None)
+            if row is not None:
+                self._ids[row] = None
+                self._payloads[row] = {}
+                self._alive[row] = False
+        self._columns.clear()
+
+    def _write(self, entries: List[dict]) -> None:
+        """Apply and log changes; call with the exclusive lock held."""
+        if not entries:
+            return
+        self._matrix.flush()
+        for entry in entries:
+            self._apply(entry)
+        if self._log_offset is None:
+            self._start_log()
+        with open(self._log_path, "r+b") as f:
+            f.truncate(self._log_offset)  # drop a line torn by a crashed writer
+            f.seek(self._log_offset)
+            data = b"".join(json.dumps(entry).encode() + b"\n" for entry in entries)
+            f.write(data)
+        self._log_offset += len(data)
+        self._log_seen = (self._log_ino, self._log_offset)
+        self._log_entries += len(entries)
+        if self._log_entries >= max(self.min_snapshot_entries, self.snapshot_ratio * len(self._rows)):
+            self._snapshot()
+
+    def _start_log(self) -> None:
+        header = json.dumps({"generation": self._generation}).encode() + b"\n"
+        tmp = self._log_path.with_suffix(".tmp")
+        tmp.write_bytes(header)
+        tmp.replace(self._log_path)
+        self._log_ino = os.stat(self._log_path).st_ino
+        self._log_offset = len(header)
+        self._log_seen = (self._log_ino, self._log_offset)
+        self._log_entries = 0
+
+    def _snapshot(self) -> None:
+        """Fold the log into a new snapshot generation and start an empty log."""
+        self._matrix.flush()
+        self._generation += 1
+        tmp = self._meta_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({
+            "dim": self.dim,
+            "generation": self._generation,
+            "ids": self._ids,
+            "payloads": self._payloads,
+        }))
+        tmp.replace(self._meta_path)
+        snapshot = os.stat(self._meta_path)
+        self._snapshot_stat = (snapshot.st_ino, snapshot.st_mtime_ns, snapshot.st_size)
+        self._start_log()
+
+    def _capacity(self) -> int:
+        if not self._matrix_path.exists():
+            return 0
+        return os.path.getsize(self._matrix_path) // (self.dim * 4)
+
+    def _ensure_capacity(self, rows: int) -> None:
+        if self._matrix is not None and rows <= len(self._matrix):
+            return
+        capacity = self._capacity()
+        if rows > capacity:
+            # Only writers get here; readers map rows a writer already allocated
+            capacity = max(rows, capacity * 2)
+            with open(self._matrix_path, "ab") as f:
+                f.truncate(capacity * self.dim * 4)
+        if self._matrix is not None:
+            self._matrix.flush()
+        self._matrix = np.memmap(
+            self._matrix_path, dtype=np.float32, mode="r+", shape=(capacity, self.dim)
+        )
+        alive = np.zeros(capacity, dtype=bool)
+        alive[: len(self._alive)] = self._alive[:capacity]
+        self._alive = alive
+
+    def compact(self) -> None:
+        """Drop tombstoned rows by rewriting live rows contiguously."""
+        with self._locked(exclusive=True):
+            self._compact()
+
+    def _compact(self) -> None:
+        live = np.flatnonzero(self._alive[: len(self._ids)])
+        self._matrix[: len(live)] = self._matrix[live]
+        self._ids = [self._ids[row] for row in live]
+        self._payloads = [self._payloads[row] for row in live]
+        self._rows = {point_id: row for row, point_id in enumerate(self._ids)}
+        self._alive[:] = False
+        self._alive[: len(live)] = True
+        self._columns.clear()
+        # Rows moved, so other instances must reload rather than replay
+        self._snapshot()
+
+    # VectorStore
+
+    def upsert(self, points: List[PointStruct]) -> None:
+        if not points:
+            return
+        vectors = np.asarray([point.vector for point in points], dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.where(norms == 0, 1, norms)
+
+        with self._locked(exclusive=True):
+            self._ensure_capacity(len(self._ids) + len(points))
+            entries = []
+            next_row = len(self._ids)
+            new_rows: Dict[str, int] = {}
+            for point, vector in zip(points, vectors):
+                point_id = str(point.id)
+                row = self._rows.get(point_id, new_rows.get(point_id))
+                if row is None:
+                    row = new_rows[point_id] = next_row
+                    next_row += 1
+                self._matrix[row] = vector
+                entries.append({"op": "put", "id": point_id, "row": row, "payload": point.payload or {}})
+            self._write(entries)
+
+    def set_payload(self, id: str, payload: dict) -> None:
+        with self._locked(exclusive=True):
+            if str(id) not in self._rows:
+                raise KeyError(f"Point {id} not found")
+            self._write([{"op": "payload", "id": str(id), "payload": payload}])
+
+    def set_payloads(self, payloads: Dict[str, dict]) -> None:
+        # One log write for the whole batch; unknown ids are skipped
+        with self._locked(exclusive=True):
+            self._write([
+                {"op": "payload", "id": str(id), "payload": payload}
+                for id, payload in payloads.items()
+                if str(id) in self._rows
+            ])
+
+    def delete(self, ids: List[str]) -> None:
+        with self._locked(exclusive=True):
+            self._write([
+                {"op": "delete", "id": str(point_id)}
+                for point_id in ids
+                if str(point_id) in self._rows
+            ])
+            dead = len(self._ids) - len(self._rows)
+            if self._ids and dead / len(self._ids) > self.compact_ratio:
+                self._compact()
+
+    def search(
+        self,
+        vector: list,
+        top_k: int,
+        query_filter: Optional[Filter] = None,
+        score_threshold: Optional[float] = None,
+    ) -> List[ScoredPoint]:
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if norm:
+            query /= norm
+
+        with self._locked(exclusive=False):
+            n = len(self._ids)
+            if n == 0 or top_k <= 0:
+                return []
+            scores = self._matrix[:n] @ query
+            mask = self._mask(query_filter, n)
+            if score_threshold is not None:
+                mask &= scores >= score_threshold
+            k = min(top_k, int(mask.sum()))
+            if k == 0:
+                return []
+            scores = np.where(mask, scores, -np.inf)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                ScoredPoint(
+                    id=self._ids[row],
+                    version=0,
+                    score=float(scores[row]),
+                    payload=self._payloads[row],
+                )
+                for row in top
+            ]
+
+    def recommend(
+        self, id: str, top_k: int, query_filter: Optional[Filter] = None
+    ) -> List[ScoredPoint]:
+        with self._locked(exclusive=False):
+            row = self._rows.get(str(id))
+            if row is None:
+                raise KeyError(f"Point {id} not found")
+            vector = np.array(self._matrix[row])
+        exclude_self = Filter(
+            must=[query_filter] if query_filter else [],
+            must_not=[HasIdCondition(has_id=[str(id)])],
+        )
+        return self.search(vector, top_k, exclude_self)
+
+    def scroll_ids(self, limit: int, offset: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        # Offsets are row numbers; a compaction between pages may skip rows
+        with self._locked(exclusive=False):
+            start = int(offset) if offset else 0
+            end = min(start + limit, len(self._ids))
+            page = [point_id for point_id in self._ids[start:end] if point_id is not None]
+            return page, (str(end) if end < len(self._ids) else None)
+
+    def existing_ids(self, ids: List[str]) -> set:
+        with self._locked(exclusive=False):
+            return {str(point_id) for point_id in ids if str(point_id) in self._rows}
+
+    # Filtering
+
+    def _column(self, key: str, n: int) -> np.ndarray:
+        """Payload field as an object array, cached until the next write."""
+        column = self._columns.get(key)
+        if column is None or len(column) != n:
+            column = np.empty(n, dtype=object)
+            column[:] = [payload.get(key) for payload in self._payloads[:n]]
+            self._columns[key] = column
+        return column
+
+    def _mask(self, query_filter: Optional[Filter], n: int) -> np.ndarray:
+        mask = self._alive[:n].copy()
+        if query_filter is None:
+            return mask
+        for condition in _as_list(query_filter.must):
+            mask &= self._condition_mask(condition, n)
+        for condition in _as_list(query_filter.must_not):
+            mask &= ~self._condition_mask(condition, n)
+        should = _as_list(query_filter.should)
+        if should:
+            any_mask = np.zeros(n, dtype=bool)
+            for condition in should:
+                any_mask |= self._condition_mask(condition, n)
+            mask &= any_mask
+        return mask
+
+    def _condition_mask(self, condition, n: int) -> np.ndarray:
+        if isinstance(condition, Filter):
+            return self._mask(condition, n)
+        if isinstance(condition, HasIdCondition):
+            wanted = {str(point_id) for point_id in condition.has_id}
+            return np.fromiter((point_id in wanted for point_id in self._ids[:n]), dtype=bool, count=n)
+        if not isinstance(condition, FieldCondition) or condition.match is None:
+            raise ValueError(f"Unsupported filter condition: {condition!r}")
+
+        match = condition.match
+        if isinstance(match, MatchValue):
+            accepted, negate = [match.value], False
+        elif isinstance(match, MatchAny):
+            accepted, negate = list(match.any), False
+        elif isinstance(match, MatchExcept):
+            accepted, negate = list(match.except_), True
+        else:
+            raise ValueError(f"Unsupported match: {match!r}")
+
+        column = self._column(condition.key, n)
+        if any(isinstance(value, list) for value in column):
+            # Array fields (e.g. album_ids) match if any element matches
+            accepted_set = set(accepted)
+            hits = np.fromiter(
+                (
+                    bool(accepted_set.intersection(value if isinstance(value, list) else [value]))
+                    for value in column
+                ),
+                dtype=bool,
+                count=n,
+            )
+        else:
+            hits = np.isin(column, accepted)
+        return ~hits if negate else hits
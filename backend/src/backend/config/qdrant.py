@@ -1,31 +1,206 @@
-from typing import Optional
+import logging
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from concurrent.futures import ThreadPoolExecutor
 import qdrant_client
-from qdrant_client.models import VectorParams, Distance, PointStruct
+from qdrant_client.models import (
+    VectorParams,
+    VectorParamsDiff,
+    CollectionParamsDiff,
+    HnswConfigDiff,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
+    QuantizationSearchParams,
+    SearchParams,
+    Disabled,
+    Distance,
+    PointStruct,
+    PointIdsList,
+    OverwritePayloadOperation,
+    SetPayload,
+    PayloadSchemaType,
+    Filter,
+    QueryRequest,
+    CreateAlias,
+    CreateAliasOperation,
+    DeleteAlias,
+    DeleteAliasOperation,
+    ScoredPoint,
+)
+
+from .settings import settings
+from .vector_store import VectorStore, get_vector_store
 
 qdrant_client_instance: Optional[qdrant_client.QdrantClient] = None
 
+logger = logging.getLogger(__name__)
+
+# Shared pool for running chunks of batch operations in parallel
+_batch_executor = ThreadPoolExecutor(
+    max_workers=settings.qdrant_batch_parallelism, thread_name_prefix="qdrant"
+)
+
+# Payload fields used in search filters; each gets a payload index
+PAYLOAD_INDEXES = {
+    "privacy": PayloadSchemaType.KEYWORD,
+    "created_by": PayloadSchemaType.KEYWORD,
+    "timestamp": PayloadSchemaType.DATETIME,
+    "album_ids": PayloadSchemaType.KEYWORD,
+}
+
+
+def _connect(prefer_grpc: bool) -> qdrant_client.QdrantClient:
+    host, port = settings.qdrant_host.split(":")
+    return qdrant_client.QdrantClient(
+        host=host,
+        port=int(port),
+        grpc_port=settings.qdrant_grpc_port,
+        api_key=settings.qdrant_api_key or None,
+        prefer_grpc=prefer_grpc,
+        https=False,
+    )
+
 
 def create_qdrant_client() -> qdrant_client.QdrantClient:
     global qdrant_client_instance
     if qdrant_client_instance is None:
-        from .settings import settings
-
-        host, port = settings.qdrant_host.split(":")
-        qdrant_client_instance = qdrant_client.QdrantClient(
-            host=host,
-            port=int(port),
-            api_key=settings.qdrant_api_key or None,
-            prefer_grpc=False,  # in config/.env, we provide http host/port/api key
-            https=False,
+        # gRPC avoids JSON (de)serialization of vectors; fall back to HTTP
+        # when the gRPC port is not reachable
+        client = None
+        if settings.qdrant_prefer_grpc:
+            try:
+                client = _connect(prefer_grpc=True)
+                client.get_collections()
+            except Exception as e:
+                logger.warning("Qdrant gRPC unavailable (%s), using HTTP", e)
+                client = None
+        qdrant_client_instance = client or _connect(prefer_grpc=False)
+        current = versioned_collection(settings.embedding_version)
+        ensure_collection(qdrant_client_instance, current, settings.embedding_dim)
+        ensure_alias(qdrant_client_instance, settings.qdrant_alias, current)
+    return qdrant_client_instance
+
+
+def versioned_collection(version: str) -> str:
+    """Physical collection holding the vectors of one embedding version."""
+    return f"{settings.qdrant_alias}_{version}"
+
+
+def alias_target(client: qdrant_client.QdrantClient, alias: str) -> Optional[str]:
+    for description in client.get_aliases().aliases:
+        if description.alias_name == alias:
+            return description.collection_name
+    return None
+
+
+def ensure_alias(client: qdrant_client.QdrantClient, alias: str, collection: str):
+    """Create the alias on first start. An existing alias is left alone: it
+    only moves through swap_alias."""
+    if alias_target(client, alias) is None:
+        client.update_collection_aliases(
+            change_aliases_operations=[
+                CreateAliasOperation(
+                    create_alias=CreateAlias(collection_name=collection, alias_name=alias)
+                )
+            ]
         )
 
-        # create images collection if not exists
-        if not qdrant_client_instance.collection_exists(collection_name="images_768"):
-            qdrant_client_instance.recreate_collection(
-                collection_name="images_768",
-                vectors_config=VectorParams(size=768, distance=Distance.COSINE),
+
+def swap_alias(client: qdrant_client.QdrantClient, alias: str, collection: str):
+    """
+    Point the alias at another collection. Both operations go in one request,
+    which Qdrant applies atomically, so searches never see a missing alias.
+    """
+    operations = []
+    if alias_target(client, alias) is not None:
+        operations.append(DeleteAliasOperation(delete_alias=DeleteAlias(alias_name=alias)))
+    operations.append(
+        CreateAliasOperation(create_alias=CreateAlias(collection_name=collection, alias_name=alias))
+    )
+    client.update_collection_aliases(change_aliases_operations=operations)
+
+
+def _quantization_config() -> Optional[ScalarQuantization]:
+    if settings.qdrant_quantization != "int8":
+        return None
+    return ScalarQuantization(
+        scalar=ScalarQuantizationConfig(
+            type=ScalarType.INT8,
+            quantile=0.99,
+            always_ram=settings.qdrant_quantization_always_ram,
+        )
+    )
+
+
+def _search_params() -> SearchParams:
+    """Search-time HNSW ef, plus rescoring when vectors are quantized."""
+    quantization = None
+    if settings.qdrant_quantization == "int8":
+        quantization = QuantizationSearchParams(
+            rescore=settings.qdrant_rescore,
+            oversampling=settings.qdrant_oversampling,
+        )
+    return SearchParams(hnsw_ef=settings.qdrant_hnsw_ef, quantization=quantization)
+
+
+def ensure_collection(client: qdrant_client.QdrantClient, name: str, size: int = 768):
+    """
+    Create the collection with the configured HNSW, quantization and on-disk
+    settings, or bring an existing collection in line with them. Never drops
+    data: changed parameters are applied with update_collection and Qdrant
+    rebuilds the affected index segments in the background.
+    """
+    quantization = _quantization_config()
+
+    if not client.collection_exists(collection_name=name):
+        client.create_collection(
+            collection_name=name,
+            vectors_config=VectorParams(
+                size=size,
+                distance=Distance.COSINE,
+                on_disk=settings.qdrant_on_disk_vectors,
+            ),
+            hnsw_config=HnswConfigDiff(
+                m=settings.qdrant_hnsw_m,
+                ef_construct=settings.qdrant_hnsw_ef_construct,
+            ),
+            quantization_config=quantization,
+            on_disk_payload=settings.qdrant_on_disk_payload,
+        )
+    else:
+        config = client.get_collection(collection_name=name).config
+        vectors = config.params.vectors
+        update = {}
+
+        if (
+            config.hnsw_config.m != settings.qdrant_hnsw_m
+            or config.hnsw_config.ef_construct != settings.qdrant_hnsw_ef_construct
+        ):
+            update["hnsw_config"] = HnswConfigDiff(
+                m=settings.qdrant_hnsw_m,
+                ef_construct=settings.qdrant_hnsw_ef_construct,
             )
-    return qdrant_client_instance
+        if bool(getattr(vectors, "on_disk", False)) != settings.qdrant_on_disk_vectors:
+            update["vectors_config"] = {"": VectorParamsDiff(on_disk=settings.qdrant_on_disk_vectors)}
+        if bool(config.params.on_disk_payload) != settings.qdrant_on_disk_payload:
+            update["collection_params"] = CollectionParamsDiff(
+                on_disk_payload=settings.qdrant_on_disk_payload
+            )
+        if config.quantization_config != quantization:
+            update["quantization_config"] = quantization or Disabled.DISABLED
+
+        if update:
+            logger.info("Updating Qdrant collection %s: %s", name, sorted(update))
+            client.update_collection(collection_name=name, **update)
+
+    # create payload indexes (no-op if they already exist)
+    for field_name, field_schema in PAYLOAD_INDEXES.items():
+        client.create_payload_index(
+            collection_name=name,
+            field_name=field_name,
+            field_schema=field_schema,
+        )
 
 def format_search_results(results) -> str:
         """Format search results as UUID | score"""
@@ -34,25 +209,300 @@ def format_search_results(results) -> str:
             lines.append(f"{point.id} | {point.score}")
         return "\n".join(lines)
 
-def add_to_qdrant(collection_name: str, points: list, id: str, payload: dict = {}):
-    client = create_qdrant_client()
+def _chunks(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class QdrantVectorStore(VectorStore):
+    """
+    VectorStore over a Qdrant collection or alias.
+
+    The live embedding version is read from the collection the alias points
+    at (re-checked every settings.qdrant_alias_refresh_seconds), so swapping
+    the alias switches searches and the model that embeds queries together.
+    During a migration new images are also embedded with the next version's
+    model and written to its collection (see write_versions), and payload
+    updates and deletes are mirrored there, best effort. Vectors are never
+    copied between versions; the backfill fills in older images and cutover
+    refuses while any image is missing.
+    """
+
+    def __init__(self, collection: Optional[str] = None, mirror: Optional[str] = None):
+        self.client = create_qdrant_client()
+        self.collection = collection or settings.qdrant_alias
+        self.mirror = mirror
+        self.mirror_version = settings.qdrant_migrate_to if mirror else None
+        if mirror:
+            ensure_collection(self.client, mirror, settings.embedding_model(self.mirror_version)[1])
+        self._live_version = settings.embedding_version
+        self._live_checked_at = float("-inf")
+        self._versions = {}
+
+    def live_version(self) -> str:
+        now = time.monotonic()
+        if now - self._live_checked_at >= settings.qdrant_alias_refresh_seconds:
+            self._live_checked_at = now
+            try:
+                target = alias_target(self.client, self.collection)
+            except Exception as e:
+                logger.warning("Could not resolve alias %s: %s", self.collection, e)
+                target = None
+            prefix = f"{settings.qdrant_alias}_"
+            if target and target.startswith(prefix):
+                version = target[len(prefix):]
+                if version in settings.embedding_models:
+                    self._live_version = version
+                else:
+                    logger.warning("Alias %s points at %s, whose version is not in EMBEDDING_MODELS", self.collection, target)
+        return self._live_version
+
+    def write_versions(self) -> List[str]:
+        live = self.live_version()
+        if self.mirror_version and self.mirror_version != live:
+            return [live, self.mirror_version]
+        return [live]
+
+    def for_version(self, version: str) -> "QdrantVectorStore":
+        if version not in self._versions:
+            self._versions[version] = QdrantVectorStore(versioned_collection(version))
+        return self._versions[version]
+
+    def _mirroring(self) -> bool:
+        # Once the alias points at the mirror, writes to it are not extra
+        return bool(self.mirror) and self.mirror_version != self.live_version()
+
+    def _mirror(self, operation, *args) -> None:
+        try:
+            operation(self.mirror, *args)
+        except Exception as e:
+            logger.warning("Mirror write to %s failed: %s", self.mirror, e)
+
+    def _upsert(self, collection: str, points: List[PointStruct]) -> None:
+        # chunks are sent in parallel on the shared batch pool
+        futures = [
+            _batch_executor.submit(
+                self.client.upsert, collection_name=collection, points=list(chunk), wait=True
+            )
+            for chunk in _chunks(points, settings.qdrant_batch_size)
+        ]
+        for future in futures:
+            future.result()
+
+    def _set_payload(self, collection: str, id: str, payload: dict) -> None:
+        self.client.overwrite_payload(collection_name=collection, payload=payload, points=[id])
+
+    def _set_payloads(self, collection: str, payloads: Dict[str, dict]) -> None:
+        # One batch_update_points request per chunk, chunks sent in parallel
+        operations = [
+            OverwritePayloadOperation(overwrite_payload=SetPayload(payload=payload, points=[id]))
+            for id, payload in payloads.items()
+        ]
+        futures = [
+            _batch_executor.submit(
+                self.client.batch_update_points,
+                collection_name=collection,
+                update_operations=list(chunk),
+                wait=True,
+            )
+            for chunk in _chunks(operations, settings.qdrant_batch_size)
+        ]
+        for future in futures:
+            future.result()
+
+    def _delete(self, collection: str, ids: List[str]) -> None:
+        futures = [
+            _batch_executor.submit(
+                self.client.delete,
+                collection_name=collection,
+                points_selector=PointIdsList(points=list(chunk)),
+                wait=True,
+            )
+            for chunk in _chunks(ids, settings.qdrant_batch_size)
+        ]
+        for future in futures:
+            future.result()
+
+    def upsert(self, points: List[PointStruct]) -> None:
+        self._upsert(self.collection, points)
+
+    def set_payload(self, id: str, payload: dict) -> None:
+        self._set_payload(self.collection, id, payload)
+        if self._mirroring():
+            self._mirror(self._set_payload, id, payload)
+
+    def set_payloads(self, payloads: Dict[str, dict]) -> None:
+        self._set_payloads(self.collection, payloads)
+        if self._mirroring():
+            self._mirror(self._set_payloads, payloads)
+
+    def delete(self, ids: List[str]) -> None:
+        self._delete(self.collection, ids)
+        if self._mirroring():
+            self._mirror(self._delete, ids)
+
+    def search(
+        self,
+        vector: list,
+        top_k: int,
+        query_filter: Optional[Filter] = None,
+        score_threshold: Optional[float] = None,
+    ) -> List[ScoredPoint]:
+        return self.client.query_points(
+            collection_name=self.collection,
+            query=vector,
+            query_filter=query_filter,
+            search_params=_search_params(),
+            score_threshold=score_threshold,
+            limit=top_k,
+        ).points
+
+    def recommend(
+        self, id: str, top_k: int, query_filter: Optional[Filter] = None
+    ) -> List[ScoredPoint]:
+        # Querying by point id reuses the stored vector; the point itself is
+        # excluded from the results by Qdrant
+        return self.client.query_points(
+            collection_name=self.collection,
+            query=id,
+            query_filter=query_filter,
+            search_params=_search_params(),
+            limit=top_k,
+        ).points
+
+    def search_batch(
+        self, vectors: List[list], top_k: int, query_filter: Optional[Filter] = None
+    ) -> List[List[ScoredPoint]]:
+        # query_batch_points makes each chunk of queries a single round trip
+        requests = [
+            QueryRequest(
+                query=vector,
+                filter=query_filter,
+                limit=top_k,
+                params=_search_params(),
+                with_payload=True,
+            )
+            for vector in vectors
+        ]
+        futures = [
+            _batch_executor.submit(
+                self.client.query_batch_points, collection_name=self.collection, requests=list(chunk)
+            )
+            for chunk in _chunks(requests, settings.qdrant_batch_size)
+        ]
+        results: List[List[ScoredPoint]] = []
+        for future in futures:
+            results.extend(response.points for response in future.result())
+        return results
+
+    def scroll_ids(self, limit: int, offset: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        points, next_offset = self.client.scroll(
+            collection_name=self.collection,
+            limit=limit,
+            offset=offset,
+            with_payload=False,
+            with_vectors=False,
+        )
+        return [str(point.id) for point in points], (str(next_offset) if next_offset else None)
+
+    def existing_ids(self, ids: List[str]) -> set:
+        points = self.client.retrieve(
+            collection_name=self.collection,
+            ids=[str(point_id) for point_id in ids],
+            with_payload=False,
+            with_vectors=False,
+        )
+        return {str(point.id) for point in points}
+
+
+# The functions below are the app-facing API. They go through the configured
+# VectorStore, so they also serve the embedded index when VECTOR_STORE=numpy.
+
+def _store(version: Optional[str] = None) -> VectorStore:
+    store = get_vector_store()
+    return store if version is None else store.for_version(version)
+
+
+def live_embedding_version() -> str:
+    """Embedding version searches run against; embed queries with its model."""
+    return get_vector_store().live_version()
+
+
+def embedding_write_versions() -> List[str]:
+    """Embedding versions a new image is stored under, the live one first."""
+    return get_vector_store().write_versions()
+
+
+def add_to_qdrant(
+    collection_name: str, points: list, id: str, payload: dict = {}, version: Optional[str] = None
+):
+    """Store one vector; `version` names the embedding version it came from."""
     point = PointStruct(
         id=id,     # unique id
         vector=points,         # your float list
         payload=payload or {}     # optional metadata
     )
-    client.upsert(collection_name="images_768", points=[point])
+    _store(version).upsert([point])
 
 
-def search_in_qdrant(collection_name: str, vector: list, top_k: int):
-    print("Searching in Qdrant...")
-    print("Vector:", vector)
-    print("Top K:", top_k)
+def update_qdrant_payload(collection_name: str, id: str, payload: dict):
+    """Overwrite the payload of an existing point, leaving its vector alone."""
+    get_vector_store().set_payload(id, payload)
+
+
+def update_qdrant_payloads(collection_name: str, payloads: Dict[str, dict]):
+    """Overwrite the payloads of many existing points in batched requests."""
+    get_vector_store().set_payloads(payloads)
+
+
+def upsert_batch(collection_name: str, points: List[PointStruct]):
+    """Upsert many points in chunks, with chunks sent in parallel."""
+    get_vector_store().upsert(points)
+
+
+def delete_batch(collection_name: str, ids: List[str]):
+    """Delete many points by id in chunks, with chunks sent in parallel."""
+    get_vector_store().delete(ids)
+
+
+def scroll_point_ids(
+    collection_name: str, limit: int, offset: Optional[str] = None
+) -> Tuple[List[str], Optional[str]]:
+    """Page through every stored point id."""
+    return get_vector_store().scroll_ids(limit, offset)
+
+
+def existing_point_ids(collection_name: str, ids: List[str]) -> set:
+    """Return the subset of ids that already have a vector."""
+    return get_vector_store().existing_ids(ids)
+
+
+def search_batch(
+    collection_name: str,
+    vectors: List[list],
+    top_k: int,
+    query_filter: Optional[Filter] = None,
+) -> List[List[ScoredPoint]]:
+    """Run one search per vector. Results are returned in input order."""
+    return get_vector_store().search_batch(vectors, top_k, query_filter)
+
+
+def recommend_in_qdrant(
+    collection_name: str, id: str, top_k: int, query_filter: Optional[Filter] = None
+) -> List[ScoredPoint]:
+    """Find points similar to an already-stored point, without re-embedding."""
+    return get_vector_store().recommend(id, top_k, query_filter)
 
-    client = create_qdrant_client()
-    search_result = client.search(
-        collection_name="images_768", query_vector=vector, limit=top_k
-    )
 
-    print("Search result:", format_search_results(search_result))
+def search_in_qdrant(
+    collection_name: str,
+    vector: list,
+    top_k: int,
+    query_filter: Optional[Filter] = None,
+    score_threshold: Optional[float] = None,
+    version: Optional[str] = None,
+):
+    search_result = _store(version).search(vector, top_k, query_filter, score_threshold)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Vector search top_k=%d:\n%s", top_k, format_search_results(search_result))
     return search_result
@@ -1,17 +1,41 @@
-from typing import Optional, List, Dict, Any
+from typing import Callable, Optional, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from PIL import Image
 from replicate.client import Client
 import io
 import json
 import hashlib
 import os
+import random
+import time
 from pathlib import Path
 import threading
 
+import logging
 import replicate.client
 
+from .settings import settings
+from backend.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from backend.utils.metrics import metrics
+
 replicate_client: Optional[Client] = None
 
+logger = logging.getLogger(__name__)
+
+# client.run() blocks until the prediction finishes, so deadlines are enforced
+# by running it on a worker thread and waiting on the future.
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="replicate")
+
+replicate_breaker = CircuitBreaker(
+    "replicate",
+    failure_threshold=settings.replicate_breaker_failure_threshold,
+    reset_timeout=settings.replicate_breaker_reset_seconds,
+)
+
+
+class EmbeddingUnavailableError(Exception):
+    """Raised when an embedding could not be produced within its deadline."""
+
 # Cache file for embeddings
 CACHE_FILE = Path(".cache.json")
 _cache_lock = threading.Lock()
@@ -75,99 +99,162 @@ def create_replicate_client() -> Client:
     """
     global replicate_client
     if replicate_client is None:
-        from .settings import settings
-
         replicate_client = Client(api_token=settings.replicate_api_key)
 
     return replicate_client
 
 
-def generate_embeddings(image: Image.Image) -> List[float]:
+def _extract_embedding(output: Any) -> List[float]:
+    """Replicate returns JSON-like data; for embeddings it's usually a list of floats."""
+    if isinstance(output, dict) and 'embedding' in output:
+        return output['embedding']
+    if isinstance(output, list):
+        return output
+    return []
+
+
+def _run_model(
+    make_input: Callable[[], Dict[str, Any]],
+    timeout: Optional[float] = None,
+    version: Optional[str] = None,
+) -> List[float]:
+    """
+    Run the embedding model of `version` (default: settings.embedding_version)
+    with a deadline, bounded retries and a circuit breaker.
+
+    `timeout` is the total budget in seconds across all attempts; it defaults to
+    `settings.replicate_timeout_seconds`. Retries use exponential backoff with
+    full jitter and never sleep past the deadline. Raises
+    EmbeddingUnavailableError if no embedding was produced in time.
+    """
+    model, dim = settings.embedding_model(version)
+    budget = settings.replicate_timeout_seconds if timeout is None else timeout
+    deadline = time.monotonic() + budget
+    client = create_replicate_client()
+    last_error: Optional[BaseException] = None
+
+    for attempt in range(settings.replicate_max_retries + 1):
+        model_input = make_input()
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+
+        # In the half-open state allow() hands out the single trial slot; from
+        # here on every path must record a success or a failure to release it
+        if not replicate_breaker.allow():
+            metrics.incr("replicate.short_circuited")
+            raise EmbeddingUnavailableError("Replicate circuit is open") from CircuitOpenError("replicate")
+
+        started = time.monotonic()
+        future = _executor.submit(client.run, model, input=model_input)
+        try:
+            output = future.result(timeout=remaining)
+        except FutureTimeoutError as e:
+            future.cancel()
+            last_error = e
+            metrics.incr("replicate.timeouts")
+        except Exception as e:
+            last_error = e
+            metrics.incr("replicate.errors")
+        else:
+            embedding = _extract_embedding(output)
+            if embedding and len(embedding) != dim:
+                # Replicate answered; the version is misconfigured. Fail fast
+                # instead of failing every upsert on the vector size.
+                replicate_breaker.record_success()
+                raise EmbeddingUnavailableError(
+                    f"{model} returned {len(embedding)} dimensions, expected {dim}"
+                )
+            if embedding:
+                metrics.observe("replicate.call_seconds", time.monotonic() - started)
+                replicate_breaker.record_success()
+                return embedding
+            last_error = ValueError("Replicate returned no embedding")
+            metrics.incr("replicate.errors")
+
+        metrics.observe("replicate.call_seconds", time.monotonic() - started)
+        replicate_breaker.record_failure()
+
+        if attempt < settings.replicate_max_retries:
+            metrics.incr("replicate.retries")
+            backoff = random.uniform(0, settings.replicate_retry_backoff_seconds * (2 ** attempt))
+            if time.monotonic() + backoff >= deadline:
+                break
+            time.sleep(backoff)
+
+    raise EmbeddingUnavailableError(f"Replicate call failed: {last_error!r}")
+
+
+def _cache_prefix(version: Optional[str]) -> str:
+    # Unprefixed keys belong to the live version, as they did before versioning
+    version = version or settings.embedding_version
+    return "" if version == settings.embedding_version else f"{version}_"
+
+
+def generate_embeddings(
+    image: Image.Image,
+    timeout: Optional[float] = None,
+    use_cache: bool = True,
+    version: Optional[str] = None,
+) -> List[float]:
     """
     Generate embeddings from a PIL image using a Replicate model.
     Returns a list of floats suitable for Qdrant add_to_qdrant().
+    Raises EmbeddingUnavailableError if Replicate does not answer in time.
+    Pass use_cache=False to bypass the local embedding cache (bulk jobs), and
+    `version` to embed with another version's model (migrations).
     """
     
     # Create cache key from image data
     buf = io.BytesIO()
     image.save(buf, format="PNG")
     image_data = buf.getvalue()
-    cache_key = _get_cache_key(f"image_{hashlib.sha256(image_data).hexdigest()}")
+    cache_key = _get_cache_key(
+        f"{_cache_prefix(version)}image_{hashlib.sha256(image_data).hexdigest()}"
+    )
     
     # Check cache first
-    cached_embedding = _get_cached_embedding(cache_key)
+    cached_embedding = _get_cached_embedding(cache_key) if use_cache else None
     if cached_embedding:
-        print(f"Using cached embedding for image (key: {cache_key[:16]}...)")
+        logger.debug("Using cached image embedding", extra={"cache_key": cache_key[:16]})
         return cached_embedding
 
-    print(f"Generating new embedding for image (key: {cache_key[:16]}...)")
-    client = create_replicate_client()
-
-    # Convert PIL image → bytes
-    buf.seek(0)
+    logger.debug("Generating image embedding", extra={"cache_key": cache_key[:16]})
 
-    # ⚠️ Replace model name/version with the embedding model you want
-    output = client.run(
-        "krthr/clip-embeddings:1c0371070cb827ec3c7f2f28adcdde54b50dcd239aa6faea0bc98b174ef03fb4",
-        input={"image": buf},  # example model
-    )
-
-    print(output)
-
-    # Replicate returns JSON-like data; for embeddings it's usually a list of floats
-    if isinstance(output, dict) and 'embedding' in output:
-        # If output is a dict with 'embedding' key
-        embedding = output['embedding']
-    elif isinstance(output, list):
-        # If output is already a list
-        embedding = output
-    else:
-        embedding = []
+    # Fresh stream per attempt so retries re-send the whole image
+    embedding = _run_model(lambda: {"image": io.BytesIO(image_data)}, timeout, version)
     
     # Cache the result
-    if embedding:
+    if embedding and use_cache:
         _save_embedding_to_cache(cache_key, embedding)
-        print(f"Cached embedding for image (key: {cache_key[:16]}...)")
     
     return embedding
 
 
-def generate_text_embeddings(text: str) -> List[float]:
+def generate_text_embeddings(
+    text: str, timeout: Optional[float] = None, version: Optional[str] = None
+) -> List[float]:
     """
     Generate embeddings from a text string using a Replicate CLIP model.
     Returns a list of floats suitable for Qdrant add_to_qdrant().
+    Raises EmbeddingUnavailableError if Replicate does not answer in time.
     """
     
     # Create cache key from text
-    cache_key = _get_cache_key(f"text_{text}")
+    cache_key = _get_cache_key(f"{_cache_prefix(version)}text_{text}")
     
     # Check cache first
     cached_embedding = _get_cached_embedding(cache_key)
     if cached_embedding:
-        print(f"Using cached embedding for text: '{text[:50]}...' (key: {cache_key[:16]}...)")
+        logger.debug("Using cached text embedding", extra={"cache_key": cache_key[:16]})
         return cached_embedding
 
-    print(f"Generating new embedding for text: '{text[:50]}...' (key: {cache_key[:16]}...)")
-    client = create_replicate_client()
-
-    output = client.run(
-        "krthr/clip-embeddings:1c0371070cb827ec3c7f2f28adcdde54b50dcd239aa6faea0bc98b174ef03fb4",
-        input={"text": text},
-    )
+    logger.debug("Generating text embedding", extra={"cache_key": cache_key[:16]})
 
-    # Convert output to list
-    if isinstance(output, dict) and 'embedding' in output:
-        # If output is a dict with 'embedding' key
-        embedding = output['embedding']
-    elif isinstance(output, list):
-        # If output is already a list
-        embedding = output
-    else:
-        embedding = []
+    embedding = _run_model(lambda: {"text": text}, timeout, version)
     
     # Cache the result
     if embedding:
         _save_embedding_to_cache(cache_key, embedding)
-        print(f"Cached embedding for text: '{text[:50]}...' (key: {cache_key[:16]}...)")
     
     return embedding
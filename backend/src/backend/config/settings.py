@@ -4,6 +4,21 @@ from dotenv import load_dotenv
 # Load .env file from current working directory
 load_dotenv(override=True)
 
+DEFAULT_EMBEDDING_MODELS = (
+    "768=krthr/clip-embeddings:1c0371070cb827ec3c7f2f28adcdde54b50dcd239aa6faea0bc98b174ef03fb4|768"
+)
+
+
+def _parse_embedding_models(spec: str) -> dict:
+    """'v1=owner/model:hash|768,v2=owner/other:hash|1024' -> {version: (model, dim)}"""
+    models = {}
+    for item in spec.split(","):
+        version, _, rest = item.strip().partition("=")
+        model, _, dim = rest.rpartition("|")
+        if version and model and dim:
+            models[version.strip()] = (model.strip(), int(dim))
+    return models
+
 
 class Settings:
     """Application settings."""
@@ -11,6 +26,8 @@ class Settings:
     def __init__(self):
         # Database
         self.database_url = os.getenv("DATABASE_URL", "sqlite:///./blog.db")
+        # Run Alembic migrations on startup; disable to run them from the CLI
+        self.db_migrate_on_startup = os.getenv("DB_MIGRATE_ON_STARTUP", "True").lower() == "true"
 
         # Application
         self.secret_key = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
@@ -19,6 +36,13 @@ class Settings:
         self.port = int(os.getenv("PORT", "8000"))
         self.allowed_hosts = os.getenv("ALLOWED_HOSTS", "*").split(",")
 
+        # Logging: LOG_LEVELS sets per-module levels ("backend.config.qdrant=DEBUG,...");
+        # only LOG_DEBUG_SAMPLE_RATE of DEBUG records are kept
+        self.log_level = os.getenv("LOG_LEVEL", "INFO")
+        self.log_format = os.getenv("LOG_FORMAT", "json").lower()  # json | text
+        self.log_levels = os.getenv("LOG_LEVELS", "sqlalchemy.engine=WARNING,sqlalchemy.pool=WARNING")
+        self.log_debug_sample_rate = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0.1"))
+
         # Session
         self.session_expire_hours = int(os.getenv("SESSION_EXPIRE_HOURS", "24"))
 
@@ -28,12 +52,82 @@ class Settings:
         self.minio_root_password = os.getenv("MINIO_ROOT_PASSWORD", "minioadmin")
         self.minio_bucket = os.getenv("MINIO_BUCKET", "gallery")
 
+        # Write-behind view/download counters are flushed this often
+        self.counter_flush_seconds = float(os.getenv("COUNTER_FLUSH_SECONDS", "5"))
+
+        # Orphan sweeper (0 disables the periodic sweep)
+        self.sweeper_interval_seconds = float(os.getenv("SWEEPER_INTERVAL_SECONDS", "3600"))
+        self.sweeper_grace_seconds = float(os.getenv("SWEEPER_GRACE_SECONDS", "3600"))
+        # On startup, rewrite every vector payload from the DB if the stored
+        # payload schema version is behind (otherwise: backfill.py --sync-payloads)
+        self.payload_sync_on_startup = os.getenv("PAYLOAD_SYNC_ON_STARTUP", "False").lower() == "true"
+
+        # Vector store: "qdrant" or "numpy" (embedded, no extra service)
+        self.vector_store = os.getenv("VECTOR_STORE", "qdrant").lower()
+        self.vector_index_path = os.getenv("VECTOR_INDEX_PATH", "./data/vector_index")
+
         # Qdrant
         self.qdrant_host = os.getenv("QDRANT_HOST", "localhost:6333")
         self.qdrant_api_key = os.getenv("QDRANT_API_KEY", "")
+        self.qdrant_grpc_port = int(os.getenv("QDRANT_GRPC_PORT", "6334"))
+        self.qdrant_prefer_grpc = os.getenv("QDRANT_PREFER_GRPC", "True").lower() == "true"
+        self.qdrant_batch_size = int(os.getenv("QDRANT_BATCH_SIZE", "256"))
+        self.qdrant_batch_parallelism = int(os.getenv("QDRANT_BATCH_PARALLELISM", "4"))
+
+        # Versioned collections: the app reads and writes through QDRANT_ALIAS,
+        # which points at <alias>_<version>. The live version is read from the
+        # alias (every QDRANT_ALIAS_REFRESH_SECONDS); EMBEDDING_VERSION only
+        # names the collection the alias starts at on a new install. While
+        # QDRANT_MIGRATE_TO is set, new images are embedded with that version
+        # too and payload updates and deletes are mirrored to its collection;
+        # older images come from the backfill. EMBEDDING_MODELS ties each
+        # version to the Replicate model (and vector size) that produces it.
+        self.embedding_models = _parse_embedding_models(
+            os.getenv("EMBEDDING_MODELS", DEFAULT_EMBEDDING_MODELS)
+        )
+        self.qdrant_alias = os.getenv("QDRANT_ALIAS", "images")
+        self.embedding_version = os.getenv("EMBEDDING_VERSION", "768")
+        self.embedding_dim = self.embedding_model(self.embedding_version)[1]
+        self.qdrant_migrate_to = os.getenv("QDRANT_MIGRATE_TO", "")
+        self.qdrant_alias_refresh_seconds = float(os.getenv("QDRANT_ALIAS_REFRESH_SECONDS", "10"))
+
+        # Qdrant collection tuning (applied to existing collections on startup)
+        self.qdrant_hnsw_m = int(os.getenv("QDRANT_HNSW_M", "16"))
+        self.qdrant_hnsw_ef_construct = int(os.getenv("QDRANT_HNSW_EF_CONSTRUCT", "100"))
+        self.qdrant_hnsw_ef = int(os.getenv("QDRANT_HNSW_EF", "128"))
+        self.qdrant_quantization = os.getenv("QDRANT_QUANTIZATION", "none").lower()  # none | int8
+        self.qdrant_quantization_always_ram = os.getenv("QDRANT_QUANTIZATION_ALWAYS_RAM", "True").lower() == "true"
+        self.qdrant_rescore = os.getenv("QDRANT_RESCORE", "True").lower() == "true"
+        self.qdrant_oversampling = float(os.getenv("QDRANT_OVERSAMPLING", "2.0"))
+        self.qdrant_on_disk_vectors = os.getenv("QDRANT_ON_DISK_VECTORS", "False").lower() == "true"
+        self.qdrant_on_disk_payload = os.getenv("QDRANT_ON_DISK_PAYLOAD", "False").lower() == "true"
 
         # Replicate
         self.replicate_api_key = os.getenv("REPLICATE_API_KEY", "")
+        self.replicate_timeout_seconds = float(os.getenv("REPLICATE_TIMEOUT_SECONDS", "30"))
+        self.replicate_max_retries = int(os.getenv("REPLICATE_MAX_RETRIES", "2"))
+        self.replicate_retry_backoff_seconds = float(os.getenv("REPLICATE_RETRY_BACKOFF_SECONDS", "0.5"))
+        self.replicate_breaker_failure_threshold = int(os.getenv("REPLICATE_BREAKER_FAILURE_THRESHOLD", "5"))
+        self.replicate_breaker_reset_seconds = float(os.getenv("REPLICATE_BREAKER_RESET_SECONDS", "30"))
+
+        # Search
+        self.search_embedding_budget_seconds = float(os.getenv("SEARCH_EMBEDDING_BUDGET_SECONDS", "2"))
+        self.search_score_threshold = float(os.getenv("SEARCH_SCORE_THRESHOLD", "0.15"))
+        self.search_deadline_seconds = float(os.getenv("SEARCH_DEADLINE_SECONDS", "2.5"))
+        self.search_workers = int(os.getenv("SEARCH_WORKERS", "16"))
+        self.search_cache_size = int(os.getenv("SEARCH_CACHE_SIZE", "2048"))
+        self.home_cache_ttl_seconds = float(os.getenv("HOME_CACHE_TTL_SECONDS", "60"))
+        self.search_cache_ttl_seconds = float(os.getenv("SEARCH_CACHE_TTL_SECONDS", "300"))
+        self.similar_images_max_results = int(os.getenv("SIMILAR_IMAGES_MAX_RESULTS", "100"))
+        self.similar_images_cache_ttl_seconds = float(os.getenv("SIMILAR_IMAGES_CACHE_TTL_SECONDS", "60"))
+
+
+    def embedding_model(self, version: str = None) -> tuple:
+        """(Replicate model, vector size) for an embedding version; defaults to the live one."""
+        version = version or self.embedding_version
+        if version not in self.embedding_models:
+            raise ValueError(f"Unknown embedding version {version!r}; add it to EMBEDDING_MODELS")
+        return self.embedding_models[version]
 
 
 # Global settings instance
@@ -0,0 +1,101 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+import threading
+
+from qdrant_client.models import Filter, PointStruct, ScoredPoint
+
+from .settings import settings
+
+
+class VectorStore(ABC):
+    """
+    Storage for image embeddings. Points, filters and results use the
+    qdrant_client models so callers do not depend on the backend in use.
+    """
+
+    @abstractmethod
+    def upsert(self, points: List[PointStruct]) -> None:
+        """Insert or replace points (vector + payload)."""
+
+    @abstractmethod
+    def set_payload(self, id: str, payload: dict) -> None:
+        """Overwrite the payload of an existing point."""
+
+    def set_payloads(self, payloads: Dict[str, dict]) -> None:
+        """Overwrite the payloads of many existing points ({id: payload})."""
+        for id, payload in payloads.items():
+            self.set_payload(id, payload)
+
+    @abstractmethod
+    def delete(self, ids: List[str]) -> None:
+        """Delete points by id; unknown ids are ignored."""
+
+    @abstractmethod
+    def search(
+        self,
+        vector: list,
+        top_k: int,
+        query_filter: Optional[Filter] = None,
+        score_threshold: Optional[float] = None,
+    ) -> List[ScoredPoint]:
+        """Return the top_k most similar points scoring at least score_threshold, best first."""
+
+    @abstractmethod
+    def recommend(
+        self, id: str, top_k: int, query_filter: Optional[Filter] = None
+    ) -> List[ScoredPoint]:
+        """Return the points most similar to a stored point, excluding itself."""
+
+    def search_batch(
+        self, vectors: List[list], top_k: int, query_filter: Optional[Filter] = None
+    ) -> List[List[ScoredPoint]]:
+        """Run one search per vector, returning results in input order."""
+        return [self.search(vector, top_k, query_filter) for vector in vectors]
+
+    @abstractmethod
+    def scroll_ids(self, limit: int, offset: Optional[str] = None) -> Tuple[List[str], Optional[str]]:
+        """Page through all point ids; returns (ids, next offset or None)."""
+
+    @abstractmethod
+    def existing_ids(self, ids: List[str]) -> set:
+        """Return the subset of ids that have a stored point."""
+
+    def live_version(self) -> str:
+        """Embedding version of the vectors searches run against; query
+        vectors must come from the same version's model."""
+        return settings.embedding_version
+
+    def write_versions(self) -> List[str]:
+        """Versions a new image is embedded with, the live one first."""
+        return [self.live_version()]
+
+    def for_version(self, version: str) -> "VectorStore":
+        """The store holding the vectors of one embedding version."""
+        return self
+
+
+vector_store_instance: Optional[VectorStore] = None
+_vector_store_lock = threading.Lock()
+
+
+def get_vector_store() -> VectorStore:
+    """
+    Creates the singleton vector store selected by VECTOR_STORE:
+    "qdrant" (default) or "numpy" for the embedded in-process index.
+    """
+    global vector_store_instance
+    with _vector_store_lock:
+        if vector_store_instance is None:
+            if settings.vector_store == "numpy":
+                from .numpy_index import NumpyVectorStore
+
+                vector_store_instance = NumpyVectorStore(settings.vector_index_path, settings.embedding_dim)
+            else:
+                from .qdrant import QdrantVectorStore, versioned_collection
+
+                # Writes are mirrored to the next collection while migrating
+                mirror = None
+                if settings.qdrant_migrate_to:
+                    mirror = versioned_collection(settings.qdrant_migrate_to)
+                vector_store_instance = QdrantVectorStore(settings.qdrant_alias, mirror)
+    return vector_store_instance
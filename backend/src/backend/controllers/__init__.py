@@ -4,6 +4,7 @@ from .albums_controller import router as albums_router
 from .images_controller import router as images_router
 from .site_controller import router as site_router
 from .collections_controller import router as collections_router
+from .search_controller import router as search_router
 
 __all__ = [
     "auth_router", 
@@ -11,5 +12,6 @@ __all__ = [
     "albums_router", 
     "images_router", 
     "site_router",
-    "collections_router"
+    "collections_router",
+    "search_router",
 ]
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlmodel import Session
 from backend.config.database import get_session
 from backend.models.dtos.image import AlbumResponseDTO, AlbumWithImagesResponseDTO
@@ -10,21 +10,24 @@ from backend.models.models import User
 router = APIRouter(prefix="/albums", tags=["albums"])
 
 @router.get("/", response_model=list[AlbumResponseDTO])
-def list_albums(session: Session = Depends(get_session)):
+def list_albums(session: Session = Depends(get_session), user: Optional[User] = Depends(get_current_user_optional)):
     service = AlbumService(session)
-    return service.list_albums()
+    return service.list_albums(user=user)
 
 @router.get("/{album_id}", response_model=AlbumWithImagesResponseDTO)
-def get_album(album_id: str, session: Session = Depends(get_session), user: Optional[User] = Depends(get_current_user_optional)):
+def get_album(
+    album_id: str,
+    limit: int = Query(48, ge=1, le=200),
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_session),
+    user: Optional[User] = Depends(get_current_user_optional)
+):
     service = AlbumService(session)
-    album = service.get_album(album_id)
-
-    filtered_images = []
-    if album and album.images:
-        for image in album.images:
-            if image.privacy == "public" or (image.privacy == "private" and user):
-                filtered_images.append(image)
-        album.images = filtered_images
+    # Privacy is filtered in the query; later pages follow next_cursor
+    try:
+        album = service.get_album(album_id, user=user, limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     if not album:
         return {"detail": "Album not found"}
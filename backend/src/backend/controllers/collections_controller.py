@@ -3,6 +3,8 @@ from sqlmodel import Session, select
 from backend.config.database import get_session
 from backend.models.models import Collection
 from backend.models.dtos.collection import CollectionDTO
+from backend.services.image_service import bump_home_version
+from backend.services.suggest_service import index_suggestion, remove_suggestion
 from typing import List
 
 router = APIRouter(prefix="/collections", tags=["collections"])
@@ -18,6 +20,8 @@ def create_collection(collection: CollectionDTO, session: Session = Depends(get_
     session.add(db_collection)
     session.commit()
     session.refresh(db_collection)
+    index_suggestion("collection", db_collection.id, db_collection.name)
+    bump_home_version()
     return CollectionDTO(id=str(db_collection.id), name=db_collection.name)
 
 @router.put("/{collection_id}", response_model=CollectionDTO)
@@ -29,6 +33,8 @@ def update_collection(collection_id: str, collection: CollectionDTO, session: Se
     session.add(db_collection)
     session.commit()
     session.refresh(db_collection)
+    index_suggestion("collection", db_collection.id, db_collection.name)
+    bump_home_version()
     return CollectionDTO(id=str(db_collection.id), name=db_collection.name)
 
 @router.delete("/{collection_id}", response_model=dict)
@@ -38,4 +44,6 @@ def delete_collection(collection_id: str, session: Session = Depends(get_session
         raise HTTPException(status_code=404, detail="Collection not found")
     session.delete(db_collection)
     session.commit()
+    remove_suggestion("collection", collection_id)
+    bump_home_version()
     return {"detail": "Collection deleted"}
@@ -1,46 +1,61 @@
 import uuid
 import json
-from backend.models.dtos.image import AlbumResponseDTO, ImageResponseDTO, CreateImageDTO
-from fastapi import APIRouter, Depends, Response, HTTPException, File, Form, UploadFile
+from backend.models.dtos.image import ImageResponseDTO, CreateImageDTO, UpdateImageDTO
+from fastapi import APIRouter, BackgroundTasks, Depends, Response, HTTPException, File, Form, UploadFile, Query
 from typing import Optional
-from sqlmodel import Session, select
+from sqlmodel import Session
 from backend.config.database import get_session
 
 from backend.services.image_service import ImageService
-from backend.config.minio import get_file_bytes_from_minio
+from backend.services.home_feed_service import HomeFeedService
+from backend.models.dtos.home import HomeResponseDTO
+from backend.models.dtos.card import ImageCardDTO
+from backend.models.dtos.comment import CommentResponseDTO
+from backend.models.dtos.interaction import InteractionsRequestDTO, ImageInteractionDTO
+from backend.config.minio import get_file_bytes_from_minio, image_id_from_object_name
+from backend.services.counter_service import counter_buffer
 from backend.config.settings import settings
 from pydantic import BaseModel
 from typing import List
 
-from backend.services.album_service import AlbumService
-from backend.models.models import Comment, Like, User
+from backend.models.models import Comment, User
 from backend.middleware.auth import get_current_user_optional
 
 router = APIRouter(prefix="/images", tags=["images"])
 
 
+def parse_cursor(cursor: Optional[str]) -> int:
+    """Decode an offset cursor; a missing cursor means the first page."""
+    try:
+        offset = int(cursor) if cursor else 0
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if offset < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return offset
+
+
 @router.get("/download/{image_filename}")
-def download_image(image_filename: str):
+def download_image(image_filename: str, download: bool = False):
     try:
         file_bytes = get_file_bytes_from_minio(image_filename)
-        # Always serve as image/png for now
-        return Response(content=file_bytes, media_type="image/png")
     except Exception as e:
         raise HTTPException(status_code=404, detail="Image not found")
+    # Every rendition, including the lightbox's original, is displayed from
+    # here; only explicit downloads (?download=1) count and save as a file
+    headers = {}
+    if download:
+        image_id = image_id_from_object_name(image_filename)
+        if image_id is not None:
+            counter_buffer.incr(image_id, "download_count")
+        headers["Content-Disposition"] = f'attachment; filename="{image_filename}"'
+    # Always serve as image/png for now
+    return Response(content=file_bytes, media_type="image/png", headers=headers)
 
 
-class HomeResponseDTO(BaseModel):
-    images: List[ImageResponseDTO]
-    albums: List[AlbumResponseDTO]
-
-
-class CommentResponseDTO(BaseModel):
-    id: str
-    user_id: str
-    image_id: str
-    content: str
-    timestamp: str
-    username: Optional[str] = None
+class SimilarImagesResponseDTO(BaseModel):
+    images: List[ImageCardDTO]
+    next_cursor: Optional[str] = None
 
 
 class CommentCreateDTO(BaseModel):
@@ -53,11 +68,28 @@ class LikeToggleResponseDTO(BaseModel):
 
 
 @router.get("/home", response_model=HomeResponseDTO)
-def get_home_images(session: Session = Depends(get_session), user: Optional[User] = Depends(get_current_user_optional)):
-    service = ImageService(session)
-    data = service.get_home_images(user=user)
-    albums = AlbumService(session).list_albums()
-    return HomeResponseDTO(images=data["images"], albums=albums)
+def get_home_images(
+    limit: int = Query(24, ge=1, le=100),
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_session),
+    user: Optional[User] = Depends(get_current_user_optional)
+):
+    # Served as prebuilt JSON; the first page usually comes straight from cache
+    try:
+        body = HomeFeedService(session).get_home_json(user=user, limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return Response(content=body, media_type="application/json")
+
+
+@router.post("/interactions", response_model=List[ImageInteractionDTO])
+def get_interactions(
+    request: InteractionsRequestDTO,
+    session: Session = Depends(get_session),
+    user: Optional[User] = Depends(get_current_user_optional)
+):
+    # Counts and liked flags for a whole grid in one call; does not count views
+    return ImageService(session).get_interactions(request.image_ids, user=user)
 
 
 @router.get("/{image_id}", response_model=ImageResponseDTO)
@@ -120,50 +152,83 @@ def create_image(
     )
 
 
+@router.put("/{image_id}", response_model=ImageResponseDTO)
+def update_image(image_id: str, image: UpdateImageDTO, session: Session = Depends(get_session)):
+    service = ImageService(session)
+    updated = service.update_image(image_id, image)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Image not found")
+    return updated
+
+
 @router.delete("/{image_id}", response_model=dict)
-def delete_image(image_id: str, session: Session = Depends(get_session)):
+def delete_image(image_id: str, background_tasks: BackgroundTasks, session: Session = Depends(get_session)):
     service = ImageService(session)
-    success = service.delete_image(image_id)
+    success = service.delete_image(image_id, background_tasks)
     if not success:
         return {"detail": "Image not found"}
     return {"detail": "Image deleted"}
 
-@router.get("/search/", response_model=List[ImageResponseDTO])
+@router.get("/search/", response_model=List[ImageCardDTO])
 def search_images(
     query: str,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     session: Session = Depends(get_session),
     user: Optional[User] = Depends(get_current_user_optional)
 ):
+    # The body stays a plain list; paging and partial-result state go in headers
     service = ImageService(session)
-    images = service.combined_search_images(query, user=user)
+    images, next_offset, partial = service.combined_search_images(
+        query, limit=limit, offset=parse_cursor(cursor), user=user
+    )
+    if next_offset is not None:
+        response.headers["X-Next-Cursor"] = str(next_offset)
+    if partial:
+        response.headers["X-Search-Partial"] = "true"
     return images
 
 
+@router.get("/{image_id}/similar", response_model=SimilarImagesResponseDTO)
+def get_similar_images(
+    image_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    session: Session = Depends(get_session),
+    user: Optional[User] = Depends(get_current_user_optional)
+):
+    service = ImageService(session)
+    page = service.similar_images(
+        image_id, limit=limit, offset=parse_cursor(cursor), user=user
+    )
+    if page is None:
+        raise HTTPException(status_code=404, detail="Image not found")
+    images, next_offset = page
+    return SimilarImagesResponseDTO(
+        images=images,
+        next_cursor=str(next_offset) if next_offset is not None else None,
+    )
+
+
 @router.get("/{image_id}/comments", response_model=List[CommentResponseDTO])
 def get_image_comments(
     image_id: str,
+    response: Response,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
     session: Session = Depends(get_session),
 ):
-    # Get comments for the image
-    comments = session.exec(
-        select(Comment).where(Comment.image_id == uuid.UUID(image_id))
-    ).all()
-    
-    # Get usernames for the comments
-    result = []
-    for comment in comments:
-        user = session.get(User, comment.user_id)
-        username = user.username if user else None
-        result.append(CommentResponseDTO(
-            id=str(comment.id),
-            user_id=str(comment.user_id),
-            image_id=str(comment.image_id),
-            content=comment.content,
-            timestamp=comment.timestamp.isoformat(),
-            username=username
-        ))
-    
-    return result
+    # The body stays a plain list; the next page cursor goes in a header
+    try:
+        comments, next_cursor = ImageService(session).get_image_comments(
+            image_id, limit=limit, cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return comments
 
 
 @router.post("/{image_id}/comments", response_model=CommentResponseDTO)
@@ -180,27 +245,11 @@ def add_comment(
         user_id_val = uuid.UUID(user_id)
     
     # Create new comment
-    comment = Comment(
-        user_id=user_id_val,
-        image_id=uuid.UUID(image_id),
-        content=comment_data.content,
-    )
-    session.add(comment)
-    session.commit()
-    session.refresh(comment)
+    comment = ImageService(session).add_comment(image_id, user_id_val, comment_data.content)
     
     # Get username
     user = session.get(User, comment.user_id)
-    username = user.username if user else None
-    
-    return CommentResponseDTO(
-        id=str(comment.id),
-        user_id=str(comment.user_id),
-        image_id=str(comment.image_id),
-        content=comment.content,
-        timestamp=comment.timestamp.isoformat(),
-        username=username
-    )
+    return CommentResponseDTO.from_comment(comment, user.username if user else None)
 
 
 @router.delete("/{image_id}/comments/{comment_id}")
@@ -218,8 +267,7 @@ def delete_comment(
     if str(comment.image_id) != image_id:
         raise HTTPException(status_code=400, detail="Comment does not belong to this image")
     
-    session.delete(comment)
-    session.commit()
+    ImageService(session).delete_comment(comment)
     return {"detail": "Comment deleted"}
 
 
@@ -235,33 +283,5 @@ def toggle_like(
     else:
         user_id_val = uuid.UUID(user_id)
     
-    # Check if like already exists
-    existing_like = session.exec(
-        select(Like).where(
-            Like.user_id == user_id_val,
-            Like.image_id == uuid.UUID(image_id)
-        )
-    ).first()
-    
-    if existing_like:
-        # Unlike - remove the like
-        session.delete(existing_like)
-        session.commit()
-        liked = False
-    else:
-        # Like - add the like
-        like = Like(
-            user_id=user_id_val,
-            image_id=uuid.UUID(image_id),
-        )
-        session.add(like)
-        session.commit()
-        liked = True
-    
-    # Get total like count
-    from sqlmodel import func
-    like_count = session.exec(
-        select(func.count()).where(Like.image_id == uuid.UUID(image_id))
-    ).first() or 0
-    
+    liked, like_count = ImageService(session).toggle_like(image_id, user_id_val)
     return LikeToggleResponseDTO(liked=liked, like_count=like_count)
\ No newline at end of file
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+from typing import List, Optional
+from backend.config.database import get_session
+from backend.middleware.auth import get_current_user_optional
+from backend.models.dtos.search import SuggestionDTO
+from backend.models.models import User
+from backend.services.suggest_service import SuggestService
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+@router.get("/suggest", response_model=List[SuggestionDTO])
+def suggest(
+    q: str,
+    limit: int = Query(10, ge=1, le=25),
+    session: Session = Depends(get_session),
+    user: Optional[User] = Depends(get_current_user_optional),
+):
+    service = SuggestService(session)
+    return service.suggest(q, limit=limit, user=user)
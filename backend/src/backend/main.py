@@ -1,10 +1,13 @@
+import asyncio
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 import logging
 
 from backend.config import settings
 from backend.config.database import create_db_and_tables
+from backend.utils.metrics import metrics
+from backend.utils.log import setup_logging
 from backend.controllers import (
     auth_router,
     user_router,
@@ -12,16 +15,19 @@ from backend.controllers import (
     images_router,
     site_router,
     collections_router,
+    search_router,
 )
 
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
+setup_logging(
+    level=settings.log_level,
+    fmt=settings.log_format,
+    levels=settings.log_levels,
+    debug_sample_rate=settings.log_debug_sample_rate,
+)
 logger = logging.getLogger(__name__)
 
-logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
-logging.getLogger("sqlalchemy.pool").setLevel(logging.WARNING)
-
 
 def create_app() -> FastAPI:
     """Create and configure FastAPI application."""
@@ -31,6 +37,8 @@ def create_app() -> FastAPI:
         description="A scalable blog backend built with FastAPI and SQLModel",
         version="1.0.0",
         debug=settings.debug,
+        # Response models are serialized by pydantic-core; orjson writes the bytes
+        default_response_class=ORJSONResponse,
     )
 
     # CORS middleware
@@ -40,9 +48,10 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-Search-Partial"],
     )
 
-    print("Allowed hosts:", settings.allowed_hosts)
+    logger.info("Allowed hosts: %s", settings.allowed_hosts)
 
     # Include routers
     app.include_router(auth_router)
@@ -51,6 +60,7 @@ def create_app() -> FastAPI:
     app.include_router(albums_router)
     app.include_router(images_router)
     app.include_router(collections_router)
+    app.include_router(search_router)
 
     # Global exception handler
     @app.exception_handler(Exception)
@@ -65,6 +75,11 @@ def create_app() -> FastAPI:
     async def health_check():
         return {"status": "healthy", "version": "1.0.0"}
 
+    # Metrics endpoint
+    @app.get("/metrics")
+    async def get_metrics():
+        return metrics.snapshot()
+
     # Root endpoint
     @app.get("/")
     async def root():
@@ -76,6 +91,11 @@ def create_app() -> FastAPI:
 # Create application instance
 app = create_app()
 
+# Background tasks, started on startup
+sweeper_task = None
+counter_flush_task = None
+payload_sync_task = None
+
 
 @app.on_event("startup")
 async def startup_event():
@@ -95,17 +115,40 @@ async def startup_event():
     create_minio_client()
     logger.info("MinIO client initialized and bucket verified/created")
 
-    # Initialize qdrant
-    from backend.config.qdrant import create_qdrant_client
+    # Initialize vector store (Qdrant or the embedded index)
+    from backend.config.vector_store import get_vector_store
 
-    create_qdrant_client()
-    logger.info("Qdrant client initialized")
+    get_vector_store()
+    logger.info(f"Vector store initialized ({settings.vector_store})")
 
     # Initialize replicate client
     from backend.config.replicate import create_replicate_client
     create_replicate_client()
     logger.info("Replicate client initialized")
 
+    # Start the orphan sweeper (reconciles DB, MinIO and vector store)
+    global sweeper_task
+    if settings.sweeper_interval_seconds > 0:
+        from backend.services.cleanup_service import run_periodic_sweeper
+
+        sweeper_task = asyncio.create_task(
+            run_periodic_sweeper(settings.sweeper_interval_seconds)
+        )
+        logger.info("Orphan sweeper started")
+
+    # Bring vector payloads in line with the DB (privacy, owner, albums)
+    global payload_sync_task
+    if settings.payload_sync_on_startup:
+        from backend.services.cleanup_service import run_payload_sync
+
+        payload_sync_task = asyncio.create_task(run_payload_sync())
+
+    # Flush buffered view/download counts periodically
+    global counter_flush_task
+    from backend.services.counter_service import run_periodic_flush
+
+    counter_flush_task = asyncio.create_task(run_periodic_flush(settings.counter_flush_seconds))
+
     # Initialize permissions and roles
     # from backend.config.database import get_session
 
@@ -134,3 +177,17 @@ async def startup_event():
 async def shutdown_event():
     """Run on application shutdown."""
     logger.info("Shutting down...")
+    if sweeper_task is not None:
+        sweeper_task.cancel()
+    if payload_sync_task is not None:
+        payload_sync_task.cancel()
+
+    # Write out any counts still buffered
+    from backend.services.counter_service import counter_buffer
+
+    if counter_flush_task is not None:
+        counter_flush_task.cancel()
+    try:
+        counter_buffer.flush()
+    except Exception:
+        logger.exception("Final counter flush failed")
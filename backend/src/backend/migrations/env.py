@@ -0,0 +1,49 @@
+"""Alembic environment: runs against the app's engine and SQLModel metadata."""
+
+from alembic import context
+from sqlmodel import SQLModel
+
+import backend.models.models  # noqa: F401  (registers the tables)
+from backend.config.database import engine
+
+target_metadata = SQLModel.metadata
+
+# Full-text search objects are created in raw SQL by revision 0003, not by models
+SEARCH_OBJECTS = {"search_vector", "ix_images_search_vector"}
+
+
+def include_object(obj, name, type_, reflected, compare_to):
+    if type_ == "table" and name.startswith("images_fts"):
+        return False
+    return name not in SEARCH_OBJECTS
+
+
+def run_migrations_offline():
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online():
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite can only alter tables by copying them
+            render_as_batch=connection.dialect.name == "sqlite",
+            transaction_per_migration=True,
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
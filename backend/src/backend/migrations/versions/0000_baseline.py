@@ -0,0 +1,148 @@
+"""baseline schema: users, sessions, images, collections, albums, likes, comments
+
+The tables as they were before migrations existed. Databases that already
+have them (built by SQLModel's create_all) skip this revision; 0001 and
+later bring both kinds up to date.
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = "0000"
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if sa.inspect(op.get_bind()).has_table("images"):
+        return
+
+    op.create_table('collections',
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('name', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_table('settings',
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('key', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('value', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_settings_key'), 'settings', ['key'], unique=True)
+    op.create_table('users',
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('username', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('display_name', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('password_hash', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('role', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_users_username'), 'users', ['username'], unique=True)
+    op.create_table('albums',
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('title', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+    sa.Column('description', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('collection_id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['collection_id'], ['collections.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_albums_collection_id'), 'albums', ['collection_id'], unique=False)
+    op.create_table('images',
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('url', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('mime_type', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('small_url', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('medium_url', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('large_url', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('title', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('caption', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('alt_text', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('license', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=True),
+    sa.Column('attribution', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=True),
+    sa.Column('privacy', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+    sa.Column('created_by', sa.Uuid(), nullable=False),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.Column('view_count', sa.Integer(), nullable=False),
+    sa.Column('download_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['created_by'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_images_created_by'), 'images', ['created_by'], unique=False)
+    op.create_table('user_sessions',
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('session_token', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('expires_at', sa.DateTime(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_user_sessions_session_token'), 'user_sessions', ['session_token'], unique=True)
+    op.create_table('comments',
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('image_id', sa.Uuid(), nullable=False),
+    sa.Column('content', sqlmodel.sql.sqltypes.AutoString(length=500), nullable=False),
+    sa.Column('timestamp', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['image_id'], ['images.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_comments_image_id'), 'comments', ['image_id'], unique=False)
+    op.create_index(op.f('ix_comments_user_id'), 'comments', ['user_id'], unique=False)
+    op.create_table('image_albums',
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('album_id', sa.Uuid(), nullable=False),
+    sa.Column('image_id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['album_id'], ['albums.id'], ),
+    sa.ForeignKeyConstraint(['image_id'], ['images.id'], ),
+    sa.PrimaryKeyConstraint('album_id', 'image_id')
+    )
+    op.create_table('likes',
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('image_id', sa.Uuid(), nullable=False),
+    sa.ForeignKeyConstraint(['image_id'], ['images.id'], ),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_likes_image_id'), 'likes', ['image_id'], unique=False)
+    op.create_index(op.f('ix_likes_user_id'), 'likes', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_table('likes')
+    op.drop_table('image_albums')
+    op.drop_table('comments')
+    op.drop_table('user_sessions')
+    op.drop_table('images')
+    op.drop_table('albums')
+    op.drop_table('users')
+    op.drop_table('settings')
+    op.drop_table('collections')
@@ -0,0 +1,66 @@
+"""like/comment counters on images, duplicate likes removed
+
+Adds the denormalized counters (databases created before migrations existed
+may already have them), fills them from the likes/comments rows and removes
+duplicate likes so the unique likes index in 0002 can be built.
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, Sequence[str], None] = "0000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    existing = {column["name"] for column in sa.inspect(bind).get_columns("images")}
+    for name in ("like_count", "comment_count"):
+        if name not in existing:
+            op.add_column("images", sa.Column(name, sa.Integer(), nullable=False, server_default="0"))
+
+    op.execute(
+        """
+        DELETE FROM likes WHERE EXISTS (
+            SELECT 1 FROM likes AS keep
+            WHERE keep.image_id = likes.image_id
+              AND keep.user_id = likes.user_id
+              AND keep.id < likes.id
+        )
+        """
+    )
+
+    # Recount in id-ordered batches, committing each, so no statement holds
+    # row locks on the whole images table
+    first_page = sa.text("SELECT id FROM images ORDER BY id LIMIT :n")
+    next_page = sa.text("SELECT id FROM images WHERE id > :last ORDER BY id LIMIT :n")
+    recount = sa.text(
+        """
+        UPDATE images SET
+            like_count = (SELECT count(*) FROM likes WHERE likes.image_id = images.id),
+            comment_count = (SELECT count(*) FROM comments WHERE comments.image_id = images.id)
+        WHERE id IN :ids
+        """
+    ).bindparams(sa.bindparam("ids", expanding=True))
+    with op.get_context().autocommit_block():
+        ids = bind.execute(first_page, {"n": BATCH_SIZE}).scalars().all()
+        while ids:
+            bind.execute(recount, {"ids": ids})
+            ids = bind.execute(next_page, {"last": ids[-1], "n": BATCH_SIZE}).scalars().all()
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("images") as batch_op:
+        batch_op.drop_column("comment_count")
+        batch_op.drop_column("like_count")
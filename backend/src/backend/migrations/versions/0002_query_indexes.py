@@ -0,0 +1,60 @@
+"""indexes for the home feed, comments, likes, albums and sessions
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, unique). The feed indexes serve ORDER BY
+# timestamp DESC, id DESC by scanning backwards, so they stay ascending.
+INDEXES = [
+    ("ix_images_timestamp_id", "images", ["timestamp", "id"], False),
+    ("ix_images_privacy_timestamp_id", "images", ["privacy", "timestamp", "id"], False),
+    ("ix_comments_image_id_timestamp", "comments", ["image_id", "timestamp", "id"], False),
+    ("ux_likes_image_id_user_id", "likes", ["image_id", "user_id"], True),
+    ("ix_image_albums_image_id", "image_albums", ["image_id"], False),
+    ("ix_albums_updated_at", "albums", ["updated_at"], False),
+    ("ix_user_sessions_expires_at", "user_sessions", ["expires_at"], False),
+]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    postgres = bind.dialect.name == "postgresql"
+
+    # CREATE INDEX CONCURRENTLY does not block writes but cannot run in a
+    # transaction; each statement commits on its own
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            if postgres:
+                # An interrupted concurrent build leaves an INVALID index that
+                # IF NOT EXISTS would keep; drop it and build again
+                invalid = bind.execute(
+                    sa.text(
+                        "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                        "WHERE c.relname = :name AND NOT i.indisvalid"
+                    ),
+                    {"name": name},
+                ).first()
+                if invalid:
+                    op.drop_index(name, table_name=table, postgresql_concurrently=True)
+            op.create_index(
+                name, table, columns, unique=unique, if_not_exists=True, postgresql_concurrently=True
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
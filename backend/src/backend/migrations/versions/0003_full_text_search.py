@@ -0,0 +1,175 @@
+"""full-text index over image title, alt_text and caption
+
+Postgres: a search_vector tsvector column kept current by a trigger,
+backfilled in id-ordered batches and indexed with a concurrently built GIN
+index. It replaces the stored generated column earlier versions added on
+startup, which rewrote the whole table under an exclusive lock.
+
+SQLite: an FTS5 table kept current by triggers. images has a UUID primary
+key, so its implicit rowid is not stable (VACUUM may renumber it); FTS rows
+are keyed through images_fts_map instead, whose INTEGER PRIMARY KEY survives
+VACUUM and is looked up by image id.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce({row}title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce({row}alt_text, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce({row}caption, '')), 'C')"
+)
+
+POSTGRES_TRIGGER = [
+    f"""
+    CREATE OR REPLACE FUNCTION images_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {SEARCH_VECTOR.format(row="NEW.")};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS images_search_vector_update ON images",
+    """
+    CREATE TRIGGER images_search_vector_update
+    BEFORE INSERT OR UPDATE OF title, alt_text, caption ON images
+    FOR EACH ROW EXECUTE FUNCTION images_search_vector_update()
+    """,
+]
+
+SQLITE_SEARCH_INDEX = [
+    """
+    CREATE TABLE images_fts_map (
+        fts_rowid INTEGER PRIMARY KEY,
+        image_id CHAR(32) NOT NULL UNIQUE
+    )
+    """,
+    "CREATE VIRTUAL TABLE images_fts USING fts5(title, alt_text, caption)",
+    """
+    CREATE TRIGGER images_fts_ai AFTER INSERT ON images BEGIN
+        INSERT INTO images_fts_map(image_id) VALUES (new.id);
+        INSERT INTO images_fts(rowid, title, alt_text, caption)
+        VALUES ((SELECT fts_rowid FROM images_fts_map WHERE image_id = new.id),
+                new.title, new.alt_text, new.caption);
+    END
+    """,
+    """
+    CREATE TRIGGER images_fts_ad AFTER DELETE ON images BEGIN
+        DELETE FROM images_fts
+        WHERE rowid = (SELECT fts_rowid FROM images_fts_map WHERE image_id = old.id);
+        DELETE FROM images_fts_map WHERE image_id = old.id;
+    END
+    """,
+    """
+    CREATE TRIGGER images_fts_au AFTER UPDATE OF title, alt_text, caption ON images BEGIN
+        UPDATE images_fts SET title = new.title, alt_text = new.alt_text, caption = new.caption
+        WHERE rowid = (SELECT fts_rowid FROM images_fts_map WHERE image_id = new.id);
+    END
+    """,
+    # Index rows that predate the FTS table
+    "INSERT INTO images_fts_map(image_id) SELECT id FROM images",
+    """
+    INSERT INTO images_fts(rowid, title, alt_text, caption)
+    SELECT m.fts_rowid, i.title, i.alt_text, i.caption
+    FROM images i JOIN images_fts_map m ON m.image_id = i.id
+    """,
+]
+
+# Also removes the rowid-keyed external-content table earlier versions created
+SQLITE_DROP = [
+    "DROP TRIGGER IF EXISTS images_fts_ai",
+    "DROP TRIGGER IF EXISTS images_fts_ad",
+    "DROP TRIGGER IF EXISTS images_fts_au",
+    "DROP TABLE IF EXISTS images_fts",
+    "DROP TABLE IF EXISTS images_fts_map",
+]
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        upgrade_postgres()
+    elif dialect == "sqlite":
+        if sa.inspect(op.get_bind()).has_table("images_fts_map"):
+            return
+        for statement in SQLITE_DROP + SQLITE_SEARCH_INDEX:
+            op.execute(statement)
+
+
+def upgrade_postgres() -> None:
+    bind = op.get_bind()
+    # Each step commits on its own: the column add and trigger swap only take
+    # brief locks, and no batch or index build runs inside one long transaction
+    with op.get_context().autocommit_block():
+        op.execute("ALTER TABLE images ADD COLUMN IF NOT EXISTS search_vector tsvector")
+        generated = bind.execute(
+            sa.text(
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_name = 'images' AND column_name = 'search_vector' "
+                "AND is_generated = 'ALWAYS'"
+            )
+        ).first()
+        if generated:
+            # Keeps the stored values; the trigger maintains them from here on
+            op.execute("ALTER TABLE images ALTER COLUMN search_vector DROP EXPRESSION")
+        for statement in POSTGRES_TRIGGER:
+            op.execute(statement)
+
+        # Rows written from here on are covered by the trigger
+        first_page = sa.text("SELECT id FROM images ORDER BY id LIMIT :n")
+        next_page = sa.text("SELECT id FROM images WHERE id > :last ORDER BY id LIMIT :n")
+        fill = sa.text(
+            f"UPDATE images SET search_vector = {SEARCH_VECTOR.format(row='')} "
+            "WHERE id IN :ids AND search_vector IS NULL"
+        ).bindparams(sa.bindparam("ids", expanding=True))
+        ids = bind.execute(first_page, {"n": BATCH_SIZE}).scalars().all()
+        while ids:
+            bind.execute(fill, {"ids": ids})
+            ids = bind.execute(next_page, {"last": ids[-1], "n": BATCH_SIZE}).scalars().all()
+
+        # An interrupted concurrent build leaves an INVALID index; rebuild it
+        invalid = bind.execute(
+            sa.text(
+                "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+                "WHERE c.relname = 'ix_images_search_vector' AND NOT i.indisvalid"
+            )
+        ).first()
+        if invalid:
+            op.drop_index("ix_images_search_vector", table_name="images", postgresql_concurrently=True)
+        op.create_index(
+            "ix_images_search_vector",
+            "images",
+            ["search_vector"],
+            if_not_exists=True,
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(
+                "ix_images_search_vector", table_name="images", if_exists=True, postgresql_concurrently=True
+            )
+            op.execute("DROP TRIGGER IF EXISTS images_search_vector_update ON images")
+            op.execute("DROP FUNCTION IF EXISTS images_search_vector_update()")
+            op.execute("ALTER TABLE images DROP COLUMN IF EXISTS search_vector")
+    elif dialect == "sqlite":
+        for statement in SQLITE_DROP:
+            op.execute(statement)
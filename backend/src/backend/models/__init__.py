@@ -1,5 +1,5 @@
 from .base import *
 from .models import User, UserSession, Image, Collection, Album, Setting, ImageAlbum, Like, Comment
 from .dtos.auth import CreateUserDTO, UserResponseDTO, LoginRequestDTO, RegisterRequestDTO, UpdateUserDTO
-from .dtos.image import CreateImageDTO, ImageResponseDTO, AlbumResponseDTO, AlbumWithImagesResponseDTO
+from .dtos.image import CreateImageDTO, UpdateImageDTO, ImageResponseDTO, AlbumResponseDTO, AlbumWithImagesResponseDTO
 from .dtos.site import GetSiteInfoDTO, UpdateSiteSettingsDTO
\ No newline at end of file
@@ -1,5 +1,10 @@
 # Export CollectionDTO
 from .collection import CollectionDTO
 from .auth import CreateUserDTO, UserResponseDTO, LoginRequestDTO, RegisterRequestDTO, UpdateUserDTO
-from .image import CreateImageDTO, ImageResponseDTO, AlbumResponseDTO, AlbumWithImagesResponseDTO
-from .site import GetSiteInfoDTO, UpdateSiteSettingsDTO
\ No newline at end of file
+from .image import CreateImageDTO, UpdateImageDTO, ImageResponseDTO, AlbumResponseDTO, AlbumWithImagesResponseDTO
+from .site import GetSiteInfoDTO, UpdateSiteSettingsDTO
+from .search import SuggestionDTO
+from .home import HomeResponseDTO
+from .comment import CommentResponseDTO
+from .interaction import InteractionsRequestDTO, ImageInteractionDTO
+from .card import ImageCardDTO
@@ -0,0 +1,33 @@
+import datetime
+import uuid
+from typing import Optional
+
+from pydantic import BaseModel
+
+from backend.models.models import Image
+
+
+class ImageCardDTO(BaseModel):
+    """The fields a grid card needs; list endpoints return these instead of full images."""
+
+    id: uuid.UUID
+    url: str
+    small_url: Optional[str] = None
+    medium_url: Optional[str] = None
+    title: Optional[str] = None
+    alt_text: Optional[str] = None
+    privacy: str
+    timestamp: datetime.datetime
+    like_count: int = 0
+    comment_count: int = 0
+    similarity_score: Optional[float] = None
+
+    @classmethod
+    def columns(cls) -> tuple:
+        """Image columns to select for a card, in field order."""
+        return tuple(getattr(Image, name) for name in cls.model_fields if name != "similarity_score")
+
+    @classmethod
+    def from_row(cls, row, similarity_score: Optional[float] = None) -> "ImageCardDTO":
+        # Rows come straight from our own select; skip re-validation
+        return cls.model_construct(**row._mapping, similarity_score=similarity_score)
@@ -0,0 +1,25 @@
+from typing import Optional
+
+from pydantic import BaseModel
+
+from backend.models.models import Comment
+
+
+class CommentResponseDTO(BaseModel):
+    id: str
+    user_id: str
+    image_id: str
+    content: str
+    timestamp: str
+    username: Optional[str] = None
+
+    @classmethod
+    def from_comment(cls, comment: Comment, username: Optional[str]) -> "CommentResponseDTO":
+        return cls(
+            id=str(comment.id),
+            user_id=str(comment.user_id),
+            image_id=str(comment.image_id),
+            content=comment.content,
+            timestamp=comment.timestamp.isoformat(),
+            username=username,
+        )
@@ -0,0 +1,12 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from .card import ImageCardDTO
+from .image import AlbumResponseDTO
+
+
+class HomeResponseDTO(BaseModel):
+    images: List[ImageCardDTO]
+    albums: List[AlbumResponseDTO]
+    next_cursor: Optional[str] = None
@@ -3,12 +3,12 @@ import uuid
 from pydantic import field_validator
 from backend.models.base import BaseModel
 from backend.models.models import Image
+from backend.models.dtos.card import ImageCardDTO
 from fastapi import UploadFile
 from typing import Optional
 
 class ImageResponseDTO(Image):
     user_liked: Optional[bool] = False
-    like_count: Optional[int] = 0
     similarity_score: Optional[float] = None
     pass
 
@@ -23,12 +23,24 @@ class CreateImageDTO(BaseModel):
     timestamp: Optional[str] = None
     albums: list[str] = []
 
+class UpdateImageDTO(BaseModel):
+    title: Optional[str] = None
+    caption: Optional[str] = None
+    alt_text: Optional[str] = None
+    license: Optional[str] = None
+    attribution: Optional[str] = None
+    privacy: Optional[str] = None
+    albums: Optional[list[str]] = None
+
 class AlbumResponseDTO(BaseModel):
     id: str
     title: str
     description: Optional[str] = None
     collection_id: str
     collection_name: Optional[str] = None
+    # Filled in by listings; not read on create/update
+    image_count: Optional[int] = None
+    cover_url: Optional[str] = None
     
     @field_validator('id', 'collection_id', mode='before')
     @classmethod
@@ -38,15 +50,5 @@ class AlbumResponseDTO(BaseModel):
         return v
 
 class AlbumWithImagesResponseDTO(AlbumResponseDTO):
-    images: list[ImageResponseDTO] = []
-
-class CommentDTO(BaseModel):
-    id: Optional[str] = None
-    user_id: str
-    image_id: str
-    content: str
-    timestamp: Optional[str] = None
-
-class CommentRequestDTO(BaseModel):
-    image_id: str
-    content: str
\ No newline at end of file
+    images: list[ImageCardDTO] = []
+    next_cursor: Optional[str] = None
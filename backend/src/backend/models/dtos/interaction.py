@@ -0,0 +1,15 @@
+import uuid
+from typing import List
+
+from pydantic import BaseModel, Field
+
+
+class InteractionsRequestDTO(BaseModel):
+    image_ids: List[uuid.UUID] = Field(max_length=200)
+
+
+class ImageInteractionDTO(BaseModel):
+    image_id: str
+    like_count: int
+    comment_count: int
+    liked: bool = False
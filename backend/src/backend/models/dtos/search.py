@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class SuggestionDTO(BaseModel):
+    text: str
+    kind: str  # "image", "album" or "collection"
+    id: str
@@ -1,3 +1,4 @@
+from sqlalchemy import Index
 from sqlmodel import Field
 import datetime
 from typing import Optional
@@ -24,7 +25,7 @@ class UserSession(BaseModel, table=True):
     id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="users.id")
     session_token: str = Field(unique=True, index=True)
-    expires_at: datetime.datetime = Field(default_factory=lambda: datetime.datetime.utcnow() + datetime.timedelta(hours=24))
+    expires_at: datetime.datetime = Field(default_factory=lambda: datetime.datetime.utcnow() + datetime.timedelta(hours=24), index=True)
     created_at: datetime.datetime = Field(default_factory=datetime.datetime.utcnow)
 
     @classmethod
@@ -41,6 +42,11 @@ class Image(BaseModel, table=True):
     """Image model."""
 
     __tablename__ = "images"
+    __table_args__ = (
+        # Home feed pages: newest first, keyed on (timestamp, id)
+        Index("ix_images_timestamp_id", "timestamp", "id"),
+        Index("ix_images_privacy_timestamp_id", "privacy", "timestamp", "id"),
+    )
 
     id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
     
@@ -64,6 +70,11 @@ class Image(BaseModel, table=True):
     view_count: int = Field(default=0)
     download_count: int = Field(default=0)
 
+    # Maintained with the like/comment rows in the same transaction;
+    # CounterService.repair_counts recomputes them
+    like_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+    comment_count: int = Field(default=0, sa_column_kwargs={"server_default": "0"})
+
 class Collection(BaseModel, table=True):
     """Collection model."""
 
@@ -76,6 +87,7 @@ class Album(BaseModel, table=True):
     """Album model."""
 
     __tablename__ = "albums"
+    __table_args__ = (Index("ix_albums_updated_at", "updated_at"),)
 
     id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
     title: str = Field(max_length=100)
@@ -97,12 +109,17 @@ class ImageAlbum(BaseModel, table=True):
     __tablename__ = "image_albums"
 
     album_id: uuid.UUID = Field(foreign_key="albums.id", primary_key=True)
-    image_id: uuid.UUID = Field(foreign_key="images.id", primary_key=True)
+    # Own index: the primary key (album_id, image_id) does not serve image lookups
+    image_id: uuid.UUID = Field(foreign_key="images.id", primary_key=True, index=True)
 
 class Like(BaseModel, table=True):
     """Like model."""
 
     __tablename__ = "likes"
+    __table_args__ = (
+        # One like per user and image; also the target of ON CONFLICT in toggle_like
+        Index("ux_likes_image_id_user_id", "image_id", "user_id", unique=True),
+    )
 
     id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="users.id", index=True)
@@ -112,6 +129,10 @@ class Comment(BaseModel, table=True):
     """Comment model."""
 
     __tablename__ = "comments"
+    __table_args__ = (
+        # Comment threads: newest first, keyed on (timestamp, id)
+        Index("ix_comments_image_id_timestamp", "image_id", "timestamp", "id"),
+    )
 
     id: Optional[uuid.UUID] = Field(default_factory=uuid.uuid4, primary_key=True)
     user_id: uuid.UUID = Field(foreign_key="users.id", index=True)
@@ -3,11 +3,19 @@ from .session_service import SessionService
 from .site_service import SiteService
 from .album_service import AlbumService
 from .image_service import ImageService
+from .suggest_service import SuggestService
+from .cleanup_service import CleanupService
+from .home_feed_service import HomeFeedService
+from .counter_service import CounterService
 
 __all__ = [
     "UserService", 
     "SessionService", 
     "SiteService", 
     "AlbumService", 
-    "ImageService"
+    "ImageService",
+    "SuggestService",
+    "CleanupService",
+    "HomeFeedService",
+    "CounterService",
 ]
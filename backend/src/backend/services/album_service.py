@@ -1,21 +1,57 @@
 import uuid
 from backend.models.models import Album, Collection, Image, ImageAlbum
-from sqlmodel import Session, select, desc
+from sqlalchemy import true, tuple_
+from sqlmodel import Session, func, select, desc
 from typing import List, Optional
+from backend.services.image_service import (
+    bump_home_version,
+    decode_keyset_cursor,
+    encode_keyset_cursor,
+)
+from backend.services.suggest_service import index_suggestion, remove_suggestion
 from backend.models.dtos.image import (
     AlbumResponseDTO,
     AlbumWithImagesResponseDTO,
-    ImageResponseDTO,
 )
+from backend.models.dtos.card import ImageCardDTO
+
+
+def visible_to(user):
+    """Anonymous visitors see public images only; any signed-in user sees all."""
+    return true() if user else Image.privacy == "public"
 
 
 class AlbumService:
     def __init__(self, session: Session):
         self.session = session
 
-    def list_albums(self) -> List[AlbumResponseDTO]:
-        albums = self.session.exec(
-            select(Album, Collection).join(Collection).order_by(Album.title)
+    def list_albums(self, user=None) -> List[AlbumResponseDTO]:
+        """
+        All albums with their visible image count and a cover thumbnail (the
+        newest visible image), in one query: counts come from a grouped
+        subquery, the cover from a per-album subquery that stops at one row.
+        """
+        counts = (
+            select(ImageAlbum.album_id, func.count().label("image_count"))
+            .join(Image, Image.id == ImageAlbum.image_id)
+            .where(visible_to(user))
+            .group_by(ImageAlbum.album_id)
+            .subquery()
+        )
+        cover = (
+            select(Image.small_url)
+            .join(ImageAlbum, ImageAlbum.image_id == Image.id)
+            .where(ImageAlbum.album_id == Album.id, visible_to(user))
+            .order_by(desc(Image.timestamp), desc(Image.id))
+            .limit(1)
+            .correlate(Album)
+            .scalar_subquery()
+        )
+        rows = self.session.exec(
+            select(Album, Collection.name, func.coalesce(counts.c.image_count, 0), cover)
+            .join(Collection)
+            .outerjoin(counts, counts.c.album_id == Album.id)
+            .order_by(Album.title)
         ).all()
         return [
             AlbumResponseDTO(
@@ -23,34 +59,55 @@ class AlbumService:
                 title=album.title,
                 description=album.description,
                 collection_id=str(album.collection_id),
-                collection_name=collection.name if collection else None,
+                collection_name=collection_name,
+                image_count=image_count,
+                cover_url=cover_url,
             )
-            for album, collection in albums
+            for album, collection_name, image_count, cover_url in rows
         ]
 
-    def get_album(self, album_id: str) -> Optional[AlbumWithImagesResponseDTO]:
-        album = self.session.get(Album, uuid.UUID(album_id))
+    def get_album(
+        self, album_id: str, user=None, limit: int = 48, cursor: Optional[str] = None
+    ) -> Optional[AlbumWithImagesResponseDTO]:
+        """
+        An album with one page of its images, newest first, keyed on
+        (timestamp, id) like the home feed. Raises ValueError on a malformed
+        album id or cursor.
+        """
+        album_uuid = uuid.UUID(album_id)
+        album = self.session.get(Album, album_uuid)
         if not album:
             return None
 
         # Get collection info
         collection = self.session.get(Collection, album.collection_id)
 
-        # Get images for this album
-        images = self.session.exec(
-            select(Image)
-            .join(ImageAlbum)
-            .where(ImageAlbum.album_id == uuid.UUID(album_id))
-            .order_by(desc(Image.timestamp))
+        stmt = (
+            select(*ImageCardDTO.columns())
+            .join(ImageAlbum, ImageAlbum.image_id == Image.id)
+            .where(ImageAlbum.album_id == album_uuid, visible_to(user))
+        )
+        if cursor:
+            timestamp, image_id = decode_keyset_cursor(cursor)
+            stmt = stmt.where(tuple_(Image.timestamp, Image.id) < tuple_(timestamp, image_id))
+        # One extra row tells us whether there is a next page
+        rows = self.session.exec(
+            stmt.order_by(desc(Image.timestamp), desc(Image.id)).limit(limit + 1)
         ).all()
 
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_keyset_cursor(rows[-1].timestamp, rows[-1].id)
+
         return AlbumWithImagesResponseDTO(
             id=str(album.id),
             title=album.title,
             description=album.description,
             collection_id=str(album.collection_id),
             collection_name=collection.name if collection else None,
-            images=[ImageResponseDTO.model_validate(image) for image in images],
+            images=[ImageCardDTO.from_row(row) for row in rows],
+            next_cursor=next_cursor,
         )
 
     def update_album(self, album_id: str, album_data) -> Optional[AlbumResponseDTO]:
@@ -63,6 +120,8 @@ class AlbumService:
         self.session.add(album)
         self.session.commit()
         self.session.refresh(album)
+        index_suggestion("album", album.id, album.title)
+        bump_home_version()
         return AlbumResponseDTO(
             id=str(album.id),
             title=album.title,
@@ -77,6 +136,8 @@ class AlbumService:
             return False
         self.session.delete(album)
         self.session.commit()
+        remove_suggestion("album", album_id)
+        bump_home_version()
         return True
 
     def create_album(self, album_data) -> Optional[AlbumResponseDTO]:
@@ -88,6 +149,8 @@ class AlbumService:
         self.session.add(new_album)
         self.session.commit()
         self.session.refresh(new_album)
+        index_suggestion("album", new_album.id, new_album.title, 0)
+        bump_home_version()
         return AlbumResponseDTO(
             id=str(new_album.id),
             title=new_album.title,
@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import Iterable, List, Optional
+
+from sqlmodel import Session, col, delete, select
+
+from backend.config.database import engine
+from backend.config.minio import delete_from_minio, image_id_from_object_name, list_minio_objects
+from backend.config.qdrant import (
+    delete_batch,
+    existing_point_ids,
+    scroll_point_ids,
+    update_qdrant_payloads,
+)
+from backend.config.settings import settings
+from backend.models.models import Comment, Image, ImageAlbum, Like, Setting
+
+logger = logging.getLogger(__name__)
+
+
+def delete_image_assets(image_id: str, filenames: List[str]) -> None:
+    """
+    Remove a deleted image's storage objects and vector point. Runs after the
+    response is sent; anything that fails here is picked up by the sweeper.
+    """
+    try:
+        delete_from_minio(filenames)
+    except Exception as e:
+        logger.warning("Could not delete storage objects for image %s: %s", image_id, e)
+    try:
+        delete_batch("images", [image_id])
+    except Exception as e:
+        logger.warning("Could not delete vector for image %s: %s", image_id, e)
+
+
+# Images whose vector payload could not be updated; the sweeper retries them
+_stale_payloads: set = set()
+_stale_payloads_lock = threading.Lock()
+
+
+def mark_payload_stale(image_id: uuid.UUID) -> None:
+    with _stale_payloads_lock:
+        _stale_payloads.add(image_id)
+
+
+def _take_stale_payloads() -> list:
+    with _stale_payloads_lock:
+        image_ids = list(_stale_payloads)
+        _stale_payloads.clear()
+    return image_ids
+
+
+def _batched(items: Iterable, size: int) -> Iterable[list]:
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+class CleanupService:
+    """Reconciles the DB, MinIO and the vector store after partial failures."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _existing_image_ids(self, image_ids: list) -> set:
+        if not image_ids:
+            return set()
+        return set(
+            self.session.exec(select(Image.id).where(col(Image.id).in_(image_ids))).all()
+        )
+
+    def sweep_orphans(self, batch_size: int = 500) -> dict:
+        stats = {"rows": 0, "points": 0, "objects": 0}
+
+        # Likes/comments/album links whose image row is gone
+        for model in (Like, Comment, ImageAlbum):
+            result = self.session.exec(
+                delete(model).where(col(model.image_id).not_in(select(Image.id)))
+            )
+            stats["rows"] += result.rowcount or 0
+        self.session.commit()
+
+        # Vector points without an image row
+        offset = None
+        while True:
+            point_ids, offset = scroll_point_ids("images", batch_size, offset)
+            candidates = [uuid.UUID(point_id) for point_id in point_ids]
+            existing = self._existing_image_ids(candidates)
+            orphans = [str(image_id) for image_id in candidates if image_id not in existing]
+            if orphans:
+                delete_batch("images", orphans)
+                stats["points"] += len(orphans)
+            if offset is None:
+                break
+
+        # Storage objects without an image row. Uploads happen before the DB
+        # commit, so recent objects are left alone.
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=settings.sweeper_grace_seconds)
+        old_objects = (
+            (name, image_id)
+            for name, modified in list_minio_objects()
+            if modified is None or modified < cutoff
+            if (image_id := image_id_from_object_name(name)) is not None
+        )
+        for batch in _batched(old_objects, batch_size):
+            existing = self._existing_image_ids(list({image_id for _, image_id in batch}))
+            orphans = [name for name, image_id in batch if image_id not in existing]
+            if orphans:
+                delete_from_minio(orphans)
+                stats["objects"] += len(orphans)
+
+        return stats
+
+    def sync_payloads(self, image_ids: Optional[list] = None, batch_size: int = 500) -> int:
+        """
+        Rewrite the vector payloads (privacy, owner, albums) of `image_ids`, or
+        of every image, from the DB, one batched write per `batch_size` images.
+        Images without a point are skipped. Returns the number of payloads written.
+        """
+        from backend.services.image_service import image_payload
+
+        synced = 0
+        last_id = None
+        while True:
+            stmt = select(Image).order_by(Image.id).limit(batch_size)
+            if image_ids is not None:
+                stmt = stmt.where(col(Image.id).in_(image_ids))
+            if last_id is not None:
+                stmt = stmt.where(col(Image.id) > last_id)
+            images = self.session.exec(stmt).all()
+            if not images:
+                return synced
+            last_id = images[-1].id
+
+            album_ids = {image.id: [] for image in images}
+            for image_id, album_id in self.session.exec(
+                select(ImageAlbum.image_id, ImageAlbum.album_id).where(
+                    col(ImageAlbum.image_id).in_(list(album_ids))
+                )
+            ).all():
+                album_ids[image_id].append(album_id)
+
+            present = existing_point_ids("images", [str(image.id) for image in images])
+            payloads = {
+                str(image.id): image_payload(image, album_ids[image.id])
+                for image in images
+                if str(image.id) in present
+            }
+            if payloads:
+                update_qdrant_payloads("images", payloads)
+                synced += len(payloads)
+
+
+def _sweep_once() -> dict:
+    with Session(engine) as session:
+        service = CleanupService(session)
+        stats = service.sweep_orphans()
+        stale = _take_stale_payloads()
+        if stale:
+            try:
+                stats["payloads"] = service.sync_payloads(stale)
+            except Exception:
+                for image_id in stale:
+                    mark_payload_stale(image_id)
+                raise
+        return stats
+
+
+# Settings row recording the image_payload schema the stored payloads have
+PAYLOAD_VERSION_KEY = "vector_payload_version"
+
+
+def _sync_all_payloads() -> Optional[int]:
+    from backend.services.image_service import PAYLOAD_SCHEMA_VERSION
+
+    with Session(engine) as session:
+        stored = session.exec(select(Setting).where(Setting.key == PAYLOAD_VERSION_KEY)).first()
+        if stored and stored.value == str(PAYLOAD_SCHEMA_VERSION):
+            return None
+        synced = CleanupService(session).sync_payloads()
+        stored = stored or Setting(key=PAYLOAD_VERSION_KEY, value="")
+        stored.value = str(PAYLOAD_SCHEMA_VERSION)
+        session.add(stored)
+        session.commit()
+        return synced
+
+
+async def run_payload_sync() -> None:
+    """
+    Rewrite every vector payload once per payload schema version (see
+    PAYLOAD_SCHEMA_VERSION), in the background at startup. Catches points
+    written before payloads carried the current fields; later starts skip it.
+    """
+    try:
+        synced = await asyncio.to_thread(_sync_all_payloads)
+        if synced is None:
+            logger.info("Vector payloads already at the current schema")
+        else:
+            logger.info("Vector payload sync finished", extra={"payloads": synced})
+    except Exception:
+        logger.exception("Vector payload sync failed; searches still filter privacy in the DB")
+
+
+async def run_periodic_sweeper(interval_seconds: float) -> None:
+    """Run the orphan sweep every `interval_seconds` until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            stats = await asyncio.to_thread(_sweep_once)
+            logger.info("Orphan sweep finished", extra=stats)
+        except Exception:
+            logger.exception("Orphan sweep failed")
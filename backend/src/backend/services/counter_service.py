@@ -0,0 +1,135 @@
+import asyncio
+import logging
+import threading
+import uuid
+from collections import defaultdict
+from typing import Dict
+
+from sqlalchemy import bindparam
+from sqlmodel import Session, col, func, select, update
+
+from backend.config.database import engine
+from backend.models.models import Comment, Image, Like
+from backend.services.suggest_service import add_suggestion_views
+from backend.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Only these columns are buffered
+BUFFERED_COUNTERS = ("view_count", "download_count")
+
+
+class CounterBuffer:
+    """
+    Write-behind buffer for view and download counts. Increments are summed
+    per image in memory; flush() applies them as one batched
+    UPDATE ... SET view_count = view_count + :views per image, so readers
+    never write and concurrent increments are never lost.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._deltas: Dict[uuid.UUID, Dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(BUFFERED_COUNTERS, 0)
+        )
+
+    def incr(self, image_id: uuid.UUID, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            self._deltas[image_id][counter] += amount
+
+    def _restore(self, deltas: Dict[uuid.UUID, Dict[str, int]]) -> None:
+        with self._lock:
+            for image_id, counts in deltas.items():
+                for counter, amount in counts.items():
+                    self._deltas[image_id][counter] += amount
+
+    def flush(self) -> int:
+        """Write pending deltas; returns the number of images updated."""
+        with self._lock:
+            deltas, self._deltas = self._deltas, defaultdict(
+                lambda: dict.fromkeys(BUFFERED_COUNTERS, 0)
+            )
+        if not deltas:
+            return 0
+
+        images = Image.__table__
+        stmt = (
+            images.update()
+            .where(images.c.id == bindparam("b_id"))
+            .values(
+                view_count=images.c.view_count + bindparam("b_views"),
+                download_count=images.c.download_count + bindparam("b_downloads"),
+            )
+        )
+        params = [
+            {"b_id": image_id, "b_views": counts["view_count"], "b_downloads": counts["download_count"]}
+            for image_id, counts in deltas.items()
+        ]
+        try:
+            with engine.begin() as conn:
+                conn.execute(stmt, params)
+        except Exception:
+            # Keep the counts for the next attempt
+            self._restore(deltas)
+            raise
+        metrics.incr("counters.flushed_images", len(params))
+        try:
+            # Suggestions are weighted by views
+            add_suggestion_views({image_id: counts["view_count"] for image_id, counts in deltas.items()})
+        except Exception as e:
+            logger.warning("Could not update suggestion weights: %s", e)
+        return len(params)
+
+
+counter_buffer = CounterBuffer()
+
+
+async def run_periodic_flush(interval_seconds: float) -> None:
+    """Flush the counter buffer every `interval_seconds` until cancelled."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(counter_buffer.flush)
+        except Exception:
+            logger.exception("Counter flush failed")
+
+
+class CounterService:
+    """Maintenance of the denormalized counters on images."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def repair_counts(self, batch_size: int = 1000) -> int:
+        """
+        Recompute like_count and comment_count from the likes and comments
+        tables. Works through images in id order, one transaction per batch,
+        so no statement locks the whole table. Returns the images processed.
+        """
+        like_count = select(func.count(Like.id)).where(Like.image_id == Image.id).scalar_subquery()
+        comment_count = (
+            select(func.count(Comment.id)).where(Comment.image_id == Image.id).scalar_subquery()
+        )
+        processed = 0
+        last_id = None
+        while True:
+            stmt = select(Image.id).order_by(Image.id).limit(batch_size)
+            if last_id is not None:
+                stmt = stmt.where(col(Image.id) > last_id)
+            ids = self.session.exec(stmt).all()
+            if not ids:
+                return processed
+            self.session.exec(
+                update(Image)
+                .where(col(Image.id).in_(ids))
+                .values(like_count=like_count, comment_count=comment_count)
+                .execution_options(synchronize_session=False)
+            )
+            self.session.commit()
+            processed += len(ids)
+            last_id = ids[-1]
+
+
+def repair_counts() -> int:
+    with Session(engine) as session:
+        return CounterService(session).repair_counts()
@@ -0,0 +1,52 @@
+from typing import Optional
+
+from sqlmodel import Session
+
+from backend.config.settings import settings
+from backend.models.dtos.home import HomeResponseDTO
+from backend.services.album_service import AlbumService
+from backend.services.image_service import ImageService, home_version
+from backend.utils.cache import SingleFlight, TTLCache
+from backend.utils.metrics import metrics
+
+# Serialized first pages of the home feed, keyed by (home version, visibility
+# scope, page size). Writes bump the version, which orphans every old entry.
+_home_cache = TTLCache(maxsize=64, ttl=settings.home_cache_ttl_seconds)
+_home_flight = SingleFlight()
+
+
+class HomeFeedService:
+    """The home page payload: a feed page plus the album list, as JSON bytes."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def _build(self, user, limit: int, cursor: Optional[str] = None) -> bytes:
+        data = ImageService(self.session).get_home_images(user=user, limit=limit, cursor=cursor)
+        albums = AlbumService(self.session).list_albums(user=user)
+        return HomeResponseDTO(
+            images=data["images"], albums=albums, next_cursor=data["next_cursor"]
+        ).model_dump_json().encode()
+
+    def get_home_json(self, user, limit: int = 24, cursor: Optional[str] = None) -> bytes:
+        # Later pages are rarer and keyed by arbitrary cursors; build them directly
+        if cursor:
+            return self._build(user, limit, cursor)
+
+        key = (home_version(), "signed_in" if user else "public", limit)
+        body = _home_cache.get(key)
+        if body is not None:
+            metrics.incr("home.cache_hit")
+            return body
+
+        def rebuild() -> bytes:
+            # Concurrent misses wait here for one rebuild instead of all querying
+            cached = _home_cache.get(key)
+            if cached is not None:
+                return cached
+            metrics.incr("home.cache_miss")
+            fresh = self._build(user, limit)
+            _home_cache.set(key, fresh)
+            return fresh
+
+        return _home_flight.do(key, rebuild)
@@ -1,44 +1,157 @@
+import base64
+import logging
+import re
+import threading
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
-from backend.models.models import Comment, Image, Album, ImageAlbum, Like
+from backend.models.models import Comment, Image, ImageAlbum, Like, User
+from backend.models.dtos.card import ImageCardDTO
+from backend.models.dtos.comment import CommentResponseDTO
+from backend.models.dtos.interaction import ImageInteractionDTO
 from backend.models.dtos.image import (
-    CommentDTO,
-    CommentRequestDTO,
     CreateImageDTO,
+    UpdateImageDTO,
     ImageResponseDTO,
-    AlbumResponseDTO,
 )
 
-from sqlmodel import Session, func, select, desc, col
-from typing import List, Optional
+from sqlalchemy import column, literal_column, table, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, func, select, desc, col, delete, update
+from fastapi import BackgroundTasks
+from typing import List, Optional, Tuple
 from PIL import Image as PILImage
 import io
 from backend.config.minio import add_image_to_minio
-from backend.config.qdrant import add_to_qdrant, search_in_qdrant
-from backend.config.replicate import generate_embeddings, generate_text_embeddings
+from backend.config.qdrant import (
+    add_to_qdrant,
+    embedding_write_versions,
+    live_embedding_version,
+    recommend_in_qdrant,
+    search_in_qdrant,
+    update_qdrant_payload,
+)
+from backend.config.replicate import (
+    EmbeddingUnavailableError,
+    generate_embeddings,
+    generate_text_embeddings,
+)
 from backend.config.settings import settings
+from backend.services.cleanup_service import delete_image_assets, mark_payload_stale
+from backend.services.counter_service import counter_buffer
+from backend.services.suggest_service import index_suggestion, remove_suggestion
+from backend.utils.cache import TTLCache
+from backend.utils.metrics import metrics
+from qdrant_client.models import Filter, FieldCondition, MatchValue
+
+logger = logging.getLogger(__name__)
+
+# Runs the embedding + vector leg of combined search alongside the SQL leg
+_search_executor = ThreadPoolExecutor(
+    max_workers=settings.search_workers, thread_name_prefix="search"
+)
+
+# Ordered (image_id, score) lists per (search version, image, visibility scope)
+_similar_cache = TTLCache(maxsize=1024, ttl=settings.similar_images_cache_ttl_seconds)
+
+# Pages of combined search as ((image_id, score) list, next_offset). Keys carry
+# the search version, so bumping it on image writes orphans every old entry.
+_search_cache = TTLCache(
+    maxsize=settings.search_cache_size, ttl=settings.search_cache_ttl_seconds
+)
+_search_version = 0
+_search_version_lock = threading.Lock()
+
+
+def bump_search_version() -> None:
+    """Invalidate cached search results after an image create/update/delete."""
+    global _search_version
+    with _search_version_lock:
+        _search_version += 1
+
+
+# Version stamp of the cached home feed (see home_feed_service); bumped by
+# image, album and collection writes
+_home_version = 0
+
+
+def bump_home_version() -> None:
+    global _home_version
+    with _search_version_lock:
+        _home_version += 1
+
+
+def home_version() -> int:
+    return _home_version
+
+
+# Bump when image_payload changes; with PAYLOAD_SYNC_ON_STARTUP on, the next
+# start rewrites every stored payload once
+PAYLOAD_SCHEMA_VERSION = 2
+
+
+def image_payload(image: Image, album_ids: list) -> dict:
+    """Qdrant payload for an image; these fields back the search filters."""
+    return {
+        "privacy": image.privacy,
+        "created_by": str(image.created_by),
+        "timestamp": image.timestamp.isoformat(),
+        "album_ids": [str(album_id) for album_id in album_ids],
+    }
+
+
+def visibility_filter(user) -> Optional[Filter]:
+    """Anonymous users only see public images; signed-in users see all."""
+    if user:
+        return None
+    return Filter(must=[FieldCondition(key="privacy", match=MatchValue(value="public"))])
+
+
+def encode_keyset_cursor(timestamp: datetime, row_id: uuid.UUID) -> str:
+    raw = f"{timestamp.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_keyset_cursor(cursor: str) -> Tuple[datetime, uuid.UUID]:
+    """Inverse of encode_keyset_cursor; raises ValueError on malformed input."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, row_id = raw.split("|")
+        return datetime.fromisoformat(timestamp), uuid.UUID(row_id)
+    except (ValueError, UnicodeDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
 
 
 class ImageService:
     def __init__(self, session: Session):
         self.session = session
 
-    def get_home_images(self, user) -> dict:
-        images = self.session.exec(select(Image).order_by(desc(Image.timestamp))).all()
-        albums = self.session.exec(
-            select(Album).order_by(desc(Album.updated_at)).limit(5)
+    def get_home_images(self, user, limit: int = 24, cursor: Optional[str] = None) -> dict:
+        """
+        One page of the home feed, newest first. Pages are keyed on
+        (timestamp, id) and served by ix_images_privacy_timestamp_id /
+        ix_images_timestamp_id, so each page is an index range scan.
+        """
+        stmt = select(*ImageCardDTO.columns())
+        if not user:
+            stmt = stmt.where(Image.privacy == "public")
+        if cursor:
+            timestamp, image_id = decode_keyset_cursor(cursor)
+            stmt = stmt.where(tuple_(Image.timestamp, Image.id) < tuple_(timestamp, image_id))
+        # One extra row tells us whether there is a next page
+        rows = self.session.exec(
+            stmt.order_by(desc(Image.timestamp), desc(Image.id)).limit(limit + 1)
         ).all()
 
-        filtered_images = []
-        for img in images:
-            if img.privacy == "public":
-                filtered_images.append(img)
-            elif user:
-                filtered_images.append(img)
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_keyset_cursor(rows[-1].timestamp, rows[-1].id)
 
         return {
-            "images": [ImageResponseDTO.model_validate(img.__dict__, from_attributes=True) for img in filtered_images],
-            "albums": [AlbumResponseDTO.model_validate(album.__dict__, from_attributes=True) for album in albums],
+            "images": [ImageCardDTO.from_row(row) for row in rows],
+            "next_cursor": next_cursor,
         }
 
     def get_image(
@@ -46,55 +159,146 @@ class ImageService:
     ) -> Optional[ImageResponseDTO]:
         image_id_uuid = uuid.UUID(image_id)
         image = self.session.get(Image, image_id_uuid)
-        like_count = self.session.exec(
-            select(func.count()).where(Like.image_id == image_id_uuid)
-        ).first()
         has_user_liked = False
         if user_id and image:
-            like_result = self.session.exec(
-                select(func.count()).where(
+            has_user_liked = self.session.exec(
+                select(Like.id).where(
                     Like.image_id == image_id_uuid, Like.user_id == user_id
-                )
-            ).first()
-            has_user_liked = (like_result or 0) > 0
+                ).limit(1)
+            ).first() is not None
 
         if image:
-            image.view_count += 1
-            self.session.add(image)
-            self.session.commit()  # Commit the view count increment
+            # Buffered and written in batches; this read never commits
+            counter_buffer.incr(image.id, "view_count")
             res = ImageResponseDTO.model_validate(image)
-            res.like_count = like_count or 0
             res.user_liked = has_user_liked
             return res
         return None
 
-    def get_image_comments(self, image_id: str) -> List[CommentDTO]:
-        image = self.session.get(Image, uuid.UUID(image_id))
-        if not image:
-            return []
-        comments = self.session.exec(
-            select(Comment)
-            .where(Comment.image_id == image_id)
-            .order_by(desc(Comment.timestamp))
+    def get_image_comments(
+        self, image_id: str, limit: int = 50, cursor: Optional[str] = None
+    ) -> Tuple[List[CommentResponseDTO], Optional[str]]:
+        """
+        One page of an image's comments, newest first, with usernames joined
+        in. Served by ix_comments_image_id_timestamp; one query per page.
+        """
+        stmt = (
+            select(Comment, User.username)
+            .join(User, User.id == Comment.user_id, isouter=True)
+            .where(Comment.image_id == uuid.UUID(image_id))
+        )
+        if cursor:
+            timestamp, comment_id = decode_keyset_cursor(cursor)
+            stmt = stmt.where(tuple_(Comment.timestamp, Comment.id) < tuple_(timestamp, comment_id))
+        rows = self.session.exec(
+            stmt.order_by(desc(Comment.timestamp), desc(Comment.id)).limit(limit + 1)
         ).all()
-        return [CommentDTO.model_validate(comment) for comment in comments]
 
-    def add_comment(
-        self, comment_data: CommentRequestDTO, user_id: uuid.UUID
-    ) -> Optional[CommentDTO]:
-        image = self.session.get(Image, comment_data.image_id)
-        if not image:
-            return None
-        comment = Comment(
-            user_id=user_id,
-            image_id=uuid.UUID(comment_data.image_id),
-            content=comment_data.content or "",
-            timestamp=datetime.utcnow(),
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            last = rows[-1][0]
+            next_cursor = encode_keyset_cursor(last.timestamp, last.id)
+        return [CommentResponseDTO.from_comment(comment, username) for comment, username in rows], next_cursor
+
+    def _bump_counter(self, image_id: uuid.UUID, column, delta: int) -> None:
+        """Adjust a denormalized counter inside the caller's transaction."""
+        self.session.exec(
+            update(Image).where(Image.id == image_id).values({column: column + delta})
         )
+
+    def add_comment(self, image_id: str, user_id: uuid.UUID, content: str) -> Comment:
+        image_uuid = uuid.UUID(image_id)
+        comment = Comment(user_id=user_id, image_id=image_uuid, content=content)
         self.session.add(comment)
+        self._bump_counter(image_uuid, Image.comment_count, 1)
         self.session.commit()
         self.session.refresh(comment)
-        return CommentDTO.model_validate(comment)
+        return comment
+
+    def delete_comment(self, comment: Comment) -> None:
+        self.session.delete(comment)
+        self._bump_counter(comment.image_id, Image.comment_count, -1)
+        self.session.commit()
+
+    def get_interactions(
+        self, image_ids: List[uuid.UUID], user=None
+    ) -> List[ImageInteractionDTO]:
+        """
+        Like/comment counts and the user's liked flags for a grid of images:
+        counts come from the denormalized columns, flags from one IN query.
+        Unknown ids, and private images for anonymous users, are left out.
+        """
+        if not image_ids:
+            return []
+        stmt = select(Image.id, Image.like_count, Image.comment_count).where(
+            col(Image.id).in_(image_ids)
+        )
+        if not user:
+            stmt = stmt.where(Image.privacy == "public")
+        counts = self.session.exec(stmt).all()
+        liked = set()
+        if user:
+            liked = set(
+                self.session.exec(
+                    select(Like.image_id).where(
+                        Like.user_id == user.id, col(Like.image_id).in_(image_ids)
+                    )
+                ).all()
+            )
+        by_id = {
+            image_id: ImageInteractionDTO(
+                image_id=str(image_id),
+                like_count=like_count,
+                comment_count=comment_count,
+                liked=image_id in liked,
+            )
+            for image_id, like_count, comment_count in counts
+        }
+        # Keep the caller's order
+        return [by_id[image_id] for image_id in dict.fromkeys(image_ids) if image_id in by_id]
+
+    def toggle_like(self, image_id: str, user_id: uuid.UUID) -> Tuple[bool, int]:
+        """
+        Like or unlike; returns (liked, like_count). One transaction of at
+        most three statements, each returning what the next step needs:
+        DELETE ... RETURNING, else INSERT ... ON CONFLICT DO NOTHING
+        RETURNING, then the counter UPDATE ... RETURNING the new count. The
+        unique (image_id, user_id) index makes concurrent toggles (double
+        clicks) collapse into a single like.
+        """
+        image_uuid = uuid.UUID(image_id)
+        likes = Like.__table__
+        dialect_insert = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}[
+            self.session.get_bind().dialect.name
+        ]
+
+        removed = self.session.execute(
+            likes.delete()
+            .where(likes.c.image_id == image_uuid, likes.c.user_id == user_id)
+            .returning(likes.c.id)
+        ).first()
+        if removed:
+            liked, delta = False, -1
+        else:
+            inserted = self.session.execute(
+                dialect_insert(likes)
+                .values(**Like(user_id=user_id, image_id=image_uuid).model_dump())
+                .on_conflict_do_nothing(index_elements=["image_id", "user_id"])
+                .returning(likes.c.id)
+            ).first()
+            # No row means a concurrent toggle inserted it first
+            liked, delta = True, 1 if inserted else 0
+
+        images = Image.__table__
+        like_count = self.session.execute(
+            images.update()
+            .where(images.c.id == image_uuid)
+            .values(like_count=images.c.like_count + delta)
+            .returning(images.c.like_count)
+        ).scalar()
+        self.session.commit()
+        return liked, like_count or 0
 
     def create_image(
         self, image_data: CreateImageDTO, user_id: uuid.UUID
@@ -165,18 +369,6 @@ class ImageService:
             download_count=0,
         )
         self.session.add(image)
-        self.session.commit()
-        self.session.refresh(image)
-
-        # Generate embedding
-        embedding = generate_embeddings(pil_img)
-
-        # Add embedding to Qdrant
-        add_to_qdrant(
-            collection_name="images",
-            points=embedding,
-            id=image_id,
-        )
 
         # Add many-to-many relationships for albums
         for album_id in image_data.albums:
@@ -186,106 +378,366 @@ class ImageService:
             )
             self.session.add(image_album)
         self.session.commit()
+        self.session.refresh(image)
+        index_suggestion("image", image.id, image.title, 0, image.privacy == "public")
+        bump_search_version()
+        bump_home_version()
+
+        # Embed with the live version's model, and while migrating with the
+        # next version's too. If Replicate is down the image is still saved
+        # and the backfill embeds it later.
+        payload = image_payload(image, image_data.albums)
+        live, *migrating = embedding_write_versions()
+        try:
+            embedding = generate_embeddings(pil_img, version=live)
+        except EmbeddingUnavailableError as e:
+            logger.warning("Skipping embedding for image %s: %s", image_id, e)
+            embedding = []
+
+        # Add embedding to Qdrant, with the fields search filters on. The
+        # image is already saved, so a vector store outage is left to the
+        # backfill rather than failing the upload (and inviting a retry).
+        if embedding:
+            try:
+                add_to_qdrant(
+                    collection_name="images",
+                    points=embedding,
+                    id=image_id,
+                    payload=payload,
+                    version=live,
+                )
+            except Exception as e:
+                logger.warning("Skipping vector for image %s: %s", image_id, e)
+        for version in migrating:
+            try:
+                add_to_qdrant(
+                    collection_name="images",
+                    points=generate_embeddings(pil_img, version=version),
+                    id=image_id,
+                    payload=payload,
+                    version=version,
+                )
+            except Exception as e:
+                logger.warning("Could not embed image %s for version %s: %s", image_id, version, e)
 
         return ImageResponseDTO.model_validate(image)
 
-    def search_images(self, query: str) -> list:
-        # Simple DB search by title/caption/alt_text
-        stmt = select(Image).where(
-            (col(Image.title).ilike(f"%{query}%"))
-            | (col(Image.caption).ilike(f"%{query}%"))
-            | (col(Image.alt_text).ilike(f"%{query}%"))
+    def update_image(
+        self, image_id: str, image_data: UpdateImageDTO
+    ) -> Optional[ImageResponseDTO]:
+        image = self.session.get(Image, uuid.UUID(image_id))
+        if not image:
+            return None
+
+        update_data = image_data.model_dump(
+            exclude_unset=True, exclude={"created_at", "updated_at"}
         )
-        images = self.session.exec(stmt).all()
-        return [ImageResponseDTO.model_validate(img) for img in images]
+        album_ids = update_data.pop("albums", None)
+        for field, value in update_data.items():
+            setattr(image, field, value)
+        self.session.add(image)
 
+        if album_ids is not None:
+            existing = self.session.exec(
+                select(ImageAlbum).where(ImageAlbum.image_id == image.id)
+            ).all()
+            for image_album in existing:
+                self.session.delete(image_album)
+            for album_id in album_ids:
+                self.session.add(
+                    ImageAlbum(album_id=uuid.UUID(album_id), image_id=image.id)
+                )
 
-    def vector_search_images(self, query_vector: list, top_k: int = 10) -> list:
-        # Vector search in Qdrant
-        results = search_in_qdrant("images", query_vector, top_k)
-        if not results:
+        self.session.commit()
+        self.session.refresh(image)
+        self.sync_qdrant_payload(image)
+        index_suggestion("image", image.id, image.title, public=image.privacy == "public")
+        bump_search_version()
+        bump_home_version()
+        return ImageResponseDTO.model_validate(image)
+
+    def sync_qdrant_payload(self, image: Image) -> None:
+        """Push the image's current privacy/owner/albums to its Qdrant point."""
+        album_ids = self.session.exec(
+            select(ImageAlbum.album_id).where(ImageAlbum.image_id == image.id)
+        ).all()
+        try:
+            update_qdrant_payload(
+                collection_name="images",
+                id=str(image.id),
+                payload=image_payload(image, list(album_ids)),
+            )
+        except Exception as e:
+            # Retried by the sweeper; searches re-check privacy in the DB meanwhile
+            logger.warning("Could not update Qdrant payload for image %s: %s", image.id, e)
+            mark_payload_stale(image.id)
+
+    def search_images(self, query: str, user=None, limit: Optional[int] = None) -> list:
+        # Simple DB search by title/caption/alt_text
+        return self._hydrate_scored(
+            [(image_id, None) for image_id in self._text_search_ids(query, user, limit)], user
+        )
+
+    def _text_search_ids(self, query: str, user=None, limit: Optional[int] = None) -> list:
+        """
+        Ids of images whose title/alt_text/caption match, best match first.
+        Uses the full-text index (tsvector on Postgres, FTS5 on SQLite);
+        every query word is prefix-matched.
+        """
+        terms = re.findall(r"\w+", query.lower())
+        if not terms:
             return []
 
-        # Extract image IDs with similarity scores, maintaining order
+        dialect = self.session.get_bind().dialect.name
+        if dialect == "postgresql":
+            tsquery = func.to_tsquery("english", " & ".join(f"{term}:*" for term in terms))
+            search_vector = literal_column("images.search_vector")
+            stmt = (
+                select(Image.id)
+                .where(search_vector.op("@@")(tsquery))
+                .order_by(desc(func.ts_rank(search_vector, tsquery)), desc(Image.timestamp))
+            )
+        elif dialect == "sqlite":
+            fts_query = " ".join('"' + term.replace('"', '""') + '"*' for term in terms)
+            images_fts = table("images_fts", column("rowid"))
+            fts_map = table("images_fts_map", column("fts_rowid"), column("image_id"))
+            stmt = (
+                select(Image.id)
+                .join(fts_map, fts_map.c.image_id == Image.id)
+                .join(images_fts, images_fts.c.rowid == fts_map.c.fts_rowid)
+                .where(literal_column("images_fts").op("MATCH")(fts_query))
+                .order_by(func.bm25(literal_column("images_fts")), desc(Image.timestamp))
+            )
+        else:
+            stmt = select(Image.id).where(
+                (col(Image.title).ilike(f"%{query}%"))
+                | (col(Image.caption).ilike(f"%{query}%"))
+                | (col(Image.alt_text).ilike(f"%{query}%"))
+            ).order_by(desc(Image.timestamp))
+
+        if not user:
+            stmt = stmt.where(Image.privacy == "public")
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return list(self.session.exec(stmt).all())
+
+    def vector_search_images(
+        self, query_vector: list, top_k: int = 10, user=None, version: Optional[str] = None
+    ) -> list:
+        return self._hydrate_scored(
+            self._vector_search_scored(query_vector, top_k, user, version), user
+        )
+
+    def _vector_search_scored(
+        self, query_vector: list, top_k: int, user=None, version: Optional[str] = None
+    ) -> list:
+        # Privacy and the score cutoff are both applied inside the vector
+        # store, so top_k results are all visible and relevant. `version` is
+        # the embedding version query_vector came from (default: the alias).
+        results = search_in_qdrant(
+            "images",
+            query_vector,
+            top_k,
+            query_filter=visibility_filter(user),
+            score_threshold=settings.search_score_threshold,
+            version=version,
+        )
+        return self._scored_ids(results)
+
+    def similar_images(
+        self, image_id: str, limit: int = 20, offset: int = 0, user=None
+    ) -> Optional[tuple[list, Optional[int]]]:
+        """
+        Images most similar to `image_id`, looked up by its stored vector.
+        Returns one page of results and the offset of the next page, if any,
+        or None if the source image does not exist or is not visible.
+        """
+        try:
+            source_id = uuid.UUID(image_id)
+        except ValueError:
+            return None
+        privacy = self.session.exec(select(Image.privacy).where(Image.id == source_id)).first()
+        if privacy is None or (not user and privacy != "public"):
+            return None
+
+        key = (_search_version, source_id, "authenticated" if user else "anonymous")
+        scored = _similar_cache.get(key)
+        if scored is None:
+            try:
+                results = recommend_in_qdrant(
+                    "images",
+                    str(source_id),
+                    settings.similar_images_max_results,
+                    query_filter=visibility_filter(user),
+                )
+            except Exception as e:
+                # No stored vector for this image (yet), or the vector store
+                # is down; not cached, so the next request tries again
+                logger.warning("Similar-image lookup failed for %s: %s", image_id, e)
+                return [], None
+            scored = self._scored_ids(results)
+            _similar_cache.set(key, scored)
+
+        end = offset + limit
+        next_offset = end if end < len(scored) else None
+        return self._hydrate_scored(scored[offset:end], user), next_offset
+
+    def _scored_ids(self, results) -> list:
+        """Extract (image_id, score) pairs from vector results, keeping their order."""
         scored_results = []
-        for point in results:
+        for point in results or []:
             try:
                 image_id = uuid.UUID(str(point.id))
                 score = float(point.score) if hasattr(point, 'score') else 0.0
-                if score > 0.15:
-                    scored_results.append((image_id, score))
+                scored_results.append((image_id, score))
             except (ValueError, TypeError):
                 continue
+        return scored_results
 
+    def _hydrate_scored(self, scored_results: list, user=None) -> list:
+        """
+        Load cards for (image_id, score) pairs in one query, keeping their order.
+        The vector store filters on privacy too, but its payloads are synced
+        best-effort, so the database has the final say on visibility.
+        """
         if not scored_results:
             return []
 
-        # Get all images in one query
+        # Get all card columns in one query
         image_ids = [result[0] for result in scored_results]
-        stmt = select(Image).where(col(Image.id).in_(image_ids))
-        images_dict = {img.id: img for img in self.session.exec(stmt).all()}
-
-        # Return images in the order of vector similarity scores
-        ordered_images = []
-        for image_id, score in scored_results:
-            if image_id in images_dict:
-                ordered_images.append(ImageResponseDTO.model_validate(images_dict[image_id]))
-
-        return ordered_images
+        stmt = select(*ImageCardDTO.columns()).where(col(Image.id).in_(image_ids))
+        if not user:
+            stmt = stmt.where(Image.privacy == "public")
+        rows = {row.id: row for row in self.session.exec(stmt).all()}
+
+        # Return cards in the order of vector similarity scores
+        return [
+            ImageCardDTO.from_row(rows[image_id], similarity_score=score)
+            for image_id, score in scored_results
+            if image_id in rows
+        ]
 
     def combined_search_images(
-        self, query: str, top_k: int = 20, user = None
-    ) -> list:
+        self, query: str, limit: int = 20, offset: int = 0, user = None
+    ) -> tuple[list, Optional[int], bool]:
         """
         Combines text-based and vector-based search results.
-        Text matches get priority (faux high similarity), then vector results by actual similarity.
+        Text matches get priority, then vector results by actual similarity.
+
+        The text (SQL) leg and the embedding + vector leg run concurrently
+        under settings.search_deadline_seconds. Returns one page of results,
+        the offset of the next page (if any), and whether the results are
+        partial because the vector leg failed or missed the deadline.
         """
         if not query.strip():
-            return []
+            return [], None, False
+
+        # Complete pages are cached per normalized query, page and visibility
+        cache_key = (
+            _search_version,
+            " ".join(query.lower().split()),
+            offset,
+            limit,
+            "authenticated" if user else "anonymous",
+        )
+        cached = _search_cache.get(cache_key)
+        if cached is not None:
+            metrics.incr("search.cache_hits")
+            page, next_offset = cached
+            return self._hydrate_scored(page, user), next_offset, False
+        metrics.incr("search.cache_misses")
+
+        started = time.monotonic()
+        # One extra row tells us whether another page exists
+        wanted = offset + limit + 1
+
+        # Start the vector leg first; it never touches the DB session. It
+        # over-fetches by `wanted` since text hits are de-duplicated out.
+        vector_future = _search_executor.submit(
+            self._vector_leg, query, 2 * wanted, user
+        )
 
         # Get exact text matches first (these are most relevant)
-        text_results = self.search_images(query)
-        
-        # Generate embedding for vector search
-        print(f"Generating text embeddings for query: '{query}'")
-        try:
-            query_vector = generate_text_embeddings(query)
-            if not query_vector:
-                print("Warning: Empty query vector, using text search only")
-                return text_results
-        except Exception as e:
-            print(f"Error generating embeddings: {e}, using text search only")
-            return text_results
-
-        print(f"Generated query vector with {len(query_vector)} dimensions")
-
-        # Get vector search results (with similarity cutoff applied)
-        vector_results = self.vector_search_images(query_vector, top_k)
-        
-        # Create final ordered list: exact text matches first, then vector results
-        text_ids = {img.id for img in text_results}
-        vector_only_results = [img for img in vector_results if img.id not in text_ids]
-        
+        text_ids = self._text_search_ids(query, user=user, limit=wanted)
+        scored = [(image_id, None) for image_id in text_ids]
+
+        # Only wait for the vector leg if text matches do not fill the page
+        vector_only = []
+        partial = False
+        if len(text_ids) < wanted:
+            remaining = settings.search_deadline_seconds - (time.monotonic() - started)
+            try:
+                vector_scored = vector_future.result(timeout=max(remaining, 0))
+            except FutureTimeoutError:
+                logger.warning("Vector search missed the deadline")
+                vector_scored, partial = [], True
+            except Exception as e:
+                logger.warning("Vector search failed, using text search only: %s", e)
+                vector_scored, partial = [], True
+
+            vector_scores = dict(vector_scored)
+            text_id_set = set(text_ids)
+            scored = [(image_id, vector_scores.get(image_id)) for image_id in text_ids]
+            vector_only = [item for item in vector_scored if item[0] not in text_id_set]
+        else:
+            vector_future.cancel()
+
+        metrics.observe("search.combined_seconds", time.monotonic() - started)
+        if partial:
+            metrics.incr("search.partial")
+
         # Combine: text matches first (highest relevance), then vector similarity
-        final_results = text_results + vector_only_results
-
-        filtered_final_results = []
-        for img in final_results:
-            if img.privacy == "public":
-                filtered_final_results.append(img)
-            elif user:
-                filtered_final_results.append(img)
-        
-        print(f"Combined search found {len(final_results)} results:")
-        print(f"  - {len(text_results)} exact text matches")
-        print(f"  - {len(vector_only_results)} vector similarity matches")
-
-        return filtered_final_results
-
-    def delete_image(self, image_id: str) -> bool:
-        image = self.session.get(Image, uuid.UUID(image_id))
+        final_scored = scored + vector_only
+
+        logger.debug(
+            "Combined search results",
+            extra={"text_matches": len(text_ids), "vector_matches": len(vector_only)},
+        )
+
+        page = final_scored[offset:offset + limit]
+        next_offset = offset + limit if len(final_scored) > offset + limit else None
+        if not partial:
+            _search_cache.set(cache_key, (page, next_offset))
+        return self._hydrate_scored(page, user), next_offset, partial
+
+    def _vector_leg(self, query: str, top_k: int, user=None) -> list:
+        """Embed the query and run the vector search. Runs off the request thread."""
+        # Bounded by the embedding budget; fails fast while the circuit is open.
+        # The version is resolved once, so the query is embedded with the
+        # model of the collection it is searched in, even across a cutover.
+        version = live_embedding_version()
+        query_vector = generate_text_embeddings(
+            query, timeout=settings.search_embedding_budget_seconds, version=version
+        )
+        if not query_vector:
+            raise EmbeddingUnavailableError("Empty query vector")
+        return self._vector_search_scored(query_vector, top_k, user=user, version=version)
+
+    def delete_image(
+        self, image_id: str, background_tasks: Optional[BackgroundTasks] = None
+    ) -> bool:
+        image_uuid = uuid.UUID(image_id)
+        image = self.session.get(Image, image_uuid)
         if not image:
             return False
+        filenames = [
+            name
+            for name in (image.url, image.small_url, image.medium_url, image.large_url)
+            if name
+        ]
+
+        # Dependent rows are removed in the same transaction as the image
+        for model in (Like, Comment, ImageAlbum):
+            self.session.exec(delete(model).where(model.image_id == image_uuid))
         self.session.delete(image)
         self.session.commit()
+        remove_suggestion("image", image_id)
+        bump_search_version()
+        bump_home_version()
+
+        # Storage objects and the vector point are removed after the response
+        if background_tasks is not None:
+            background_tasks.add_task(delete_image_assets, image_id, filenames)
+        else:
+            delete_image_assets(image_id, filenames)
         return True
@@ -22,7 +22,6 @@ class SiteService:
 
     def get_site_info(self, user: Optional[User]) -> GetSiteInfoDTO:
         settings = self.get_site_settings()
-        print(settings)
         dto = (
             UserResponseDTO(
                 id=str(user.id),
@@ -0,0 +1,264 @@
+import bisect
+import heapq
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlmodel import Session, col, func, select
+
+from backend.config.database import engine
+
+from backend.models.models import Album, Collection, Image, ImageAlbum
+from backend.models.dtos.search import SuggestionDTO
+
+# Prefixes up to SHORT_PREFIX characters can match much of the index. Each
+# keeps its best TOP_K entries (the suggest endpoint's largest page), built on
+# first use and kept current by every change, so they rank every match
+# without a scan; longer prefixes match few keys and rank them per query.
+SHORT_PREFIX = 3
+TOP_K = 25
+
+Rank = Tuple[int, str, str, str]  # (-weight, text, kind, id); smaller is better
+
+
+def _normalize(text: str) -> str:
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def _rank(kind: str, id: str, entry: dict) -> Rank:
+    return (-entry["weight"], entry["text"], kind, id)
+
+
+class PrefixIndex:
+    """
+    Sorted-array prefix index. Every word start of an entry's text is a key,
+    so "sun" matches "Beach sunset". Lookups are a bisect plus a scan of the
+    matching keys, or a precomputed top list for short prefixes.
+    """
+
+    def __init__(self):
+        self._keys: List[Tuple[str, str, str]] = []  # (suffix, kind, id), sorted
+        self._entries: Dict[Tuple[str, str], dict] = {}
+        # (prefix, include_private) -> best matches, sorted. A list shorter
+        # than TOP_K holds every match.
+        self._top: Dict[Tuple[str, bool], List[Rank]] = {}
+
+    def _suffixes(self, text: str) -> List[str]:
+        normalized = _normalize(text)
+        return [normalized[m.start():] for m in re.finditer(r"\b\w", normalized)]
+
+    def _tops_for(self, entry: dict) -> List[Tuple[str, bool]]:
+        """Keys of the built top lists the entry can appear in."""
+        prefixes = {
+            suffix[:length]
+            for suffix in entry["suffixes"]
+            for length in range(1, min(len(suffix), SHORT_PREFIX) + 1)
+        }
+        return [
+            (prefix, include_private)
+            for prefix in prefixes
+            for include_private in (True, False)
+            if (entry["public"] or include_private) and (prefix, include_private) in self._top
+        ]
+
+    def _enter_tops(self, kind: str, id: str, entry: dict) -> None:
+        rank = _rank(kind, id, entry)
+        for key in self._tops_for(entry):
+            top = self._top[key]
+            if len(top) < TOP_K or rank < top[-1]:
+                bisect.insort(top, rank)
+                del top[TOP_K:]
+
+    def _leave_tops(self, entry: dict, rank: Rank, rising: bool = False) -> None:
+        """
+        Take an entry out of the top lists. A full list may then be missing a
+        match, so it is dropped and rebuilt on next use, unless the entry is
+        `rising` (it goes straight back in with a better rank).
+        """
+        for key in self._tops_for(entry):
+            top = self._top[key]
+            index = bisect.bisect_left(top, rank)
+            if index < len(top) and top[index] == rank:
+                if len(top) == TOP_K and not rising:
+                    del self._top[key]
+                else:
+                    del top[index]
+
+    def upsert(
+        self, kind: str, id: str, text: Optional[str], weight: Optional[int] = None, public: bool = True
+    ) -> None:
+        """Add or replace an entry; weight=None keeps the current weight."""
+        if weight is None:
+            weight = self._entries.get((kind, id), {}).get("weight", 0)
+        self.remove(kind, id)
+        if not text or not text.strip():
+            return
+        suffixes = self._suffixes(text)
+        entry = self._entries[(kind, id)] = {
+            "text": text,
+            "weight": weight,
+            "public": public,
+            "suffixes": suffixes,
+        }
+        for suffix in suffixes:
+            bisect.insort(self._keys, (suffix, kind, id))
+        self._enter_tops(kind, id, entry)
+
+    def add_weight(self, kind: str, id: str, amount: int) -> None:
+        """Change an entry's weight by `amount`; unknown entries are ignored."""
+        entry = self._entries.get((kind, id))
+        if not entry or not amount:
+            return
+        self._leave_tops(entry, _rank(kind, id, entry), rising=amount > 0)
+        entry["weight"] += amount
+        self._enter_tops(kind, id, entry)
+
+    def load(self, entries: List[Tuple[str, str, Optional[str], int, bool]]) -> None:
+        """Replace the contents with (kind, id, text, weight, public) rows, sorting once."""
+        self._entries = {}
+        self._top = {}
+        keys = []
+        for kind, id, text, weight, public in entries:
+            if not text or not text.strip():
+                continue
+            suffixes = self._suffixes(text)
+            self._entries[(kind, id)] = {
+                "text": text,
+                "weight": weight,
+                "public": public,
+                "suffixes": suffixes,
+            }
+            keys.extend((suffix, kind, id) for suffix in suffixes)
+        keys.sort()
+        self._keys = keys
+
+    def remove(self, kind: str, id: str) -> None:
+        entry = self._entries.pop((kind, id), None)
+        if not entry:
+            return
+        self._leave_tops(entry, _rank(kind, id, entry))
+        for suffix in entry["suffixes"]:
+            key = (suffix, kind, id)
+            index = bisect.bisect_left(self._keys, key)
+            if index < len(self._keys) and self._keys[index] == key:
+                del self._keys[index]
+
+    def _matches(self, prefix: str, include_private: bool) -> List[Rank]:
+        """Ranks of every entry with a key starting with `prefix`, unsorted."""
+        seen = set()
+        matches = []
+        index = bisect.bisect_left(self._keys, (prefix,))
+        while index < len(self._keys) and self._keys[index][0].startswith(prefix):
+            _, kind, id = self._keys[index]
+            index += 1
+            if (kind, id) in seen:
+                continue
+            seen.add((kind, id))
+            entry = self._entries[(kind, id)]
+            if entry["public"] or include_private:
+                matches.append(_rank(kind, id, entry))
+        return matches
+
+    def search(self, prefix: str, limit: int, include_private: bool) -> List[SuggestionDTO]:
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+        if len(prefix) <= SHORT_PREFIX and limit <= TOP_K:
+            key = (prefix, include_private)
+            if key not in self._top:
+                self._top[key] = heapq.nsmallest(TOP_K, self._matches(prefix, include_private))
+            ranked = self._top[key][:limit]
+        else:
+            ranked = heapq.nsmallest(limit, self._matches(prefix, include_private))
+        return [
+            SuggestionDTO(text=self._entries[(kind, id)]["text"], kind=kind, id=id)
+            for _, _, kind, id in ranked
+        ]
+
+
+# Process-wide index, built from the DB on first use and then kept current by
+# the image/album/collection write paths
+suggestion_index = PrefixIndex()
+_index_lock = threading.RLock()
+_index_loaded = False
+
+
+class SuggestService:
+    """Typeahead over image titles, album titles and collection names."""
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    def ensure_loaded(self) -> None:
+        global _index_loaded
+        with _index_lock:
+            if _index_loaded:
+                return
+            entries = []
+            images = self.session.exec(
+                select(Image.id, Image.title, Image.privacy, Image.view_count)
+                .where(Image.title.is_not(None))
+            ).all()
+            for image_id, title, privacy, view_count in images:
+                entries.append(("image", str(image_id), title, view_count or 0, privacy == "public"))
+
+            # Albums are weighted by the total views of their images
+            album_views = dict(
+                self.session.exec(
+                    select(ImageAlbum.album_id, func.sum(Image.view_count))
+                    .join(Image, Image.id == ImageAlbum.image_id)
+                    .group_by(ImageAlbum.album_id)
+                ).all()
+            )
+            for album_id, title in self.session.exec(select(Album.id, Album.title)).all():
+                entries.append(("album", str(album_id), title, int(album_views.get(album_id) or 0), True))
+
+            for collection_id, name in self.session.exec(select(Collection.id, Collection.name)).all():
+                entries.append(("collection", str(collection_id), name, 0, True))
+
+            suggestion_index.load(entries)
+            _index_loaded = True
+
+    def suggest(self, query: str, limit: int = 10, user=None) -> List[SuggestionDTO]:
+        self.ensure_loaded()
+        with _index_lock:
+            return suggestion_index.search(query, limit, include_private=bool(user))
+
+
+def index_suggestion(
+    kind: str, id, text: Optional[str], weight: Optional[int] = None, public: bool = True
+) -> None:
+    """Add or refresh one entry. A no-op until the index has been built."""
+    with _index_lock:
+        if _index_loaded:
+            suggestion_index.upsert(kind, str(id), text, weight, public)
+
+
+def remove_suggestion(kind: str, id) -> None:
+    with _index_lock:
+        if _index_loaded:
+            suggestion_index.remove(kind, str(id))
+
+
+def add_suggestion_views(views: Dict) -> None:
+    """
+    Raise the weights of images, and of the albums they are in, by newly
+    flushed view counts ({image_id: views}). A no-op until the index is built.
+    """
+    views = {image_id: count for image_id, count in views.items() if count}
+    if not views or not _index_loaded:
+        return
+    album_views = defaultdict(int)
+    with Session(engine) as session:
+        for image_id, album_id in session.exec(
+            select(ImageAlbum.image_id, ImageAlbum.album_id).where(
+                col(ImageAlbum.image_id).in_(list(views))
+            )
+        ).all():
+            album_views[album_id] += views[image_id]
+    with _index_lock:
+        for image_id, count in views.items():
+            suggestion_index.add_weight("image", str(image_id), count)
+        for album_id, count in album_views.items():
+            suggestion_index.add_weight("album", str(album_id), count)
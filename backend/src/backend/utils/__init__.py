@@ -6,6 +6,10 @@ from .exceptions import (
     NotFoundError,
     ConflictError,
 )
+from .metrics import metrics
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .cache import SingleFlight, TTLCache
+from .log import setup_logging
 
 __all__ = [
     "hash_password",
@@ -15,4 +19,10 @@ __all__ = [
     "ValidationError",
     "NotFoundError",
     "ConflictError",
+    "metrics",
+    "CircuitBreaker",
+    "CircuitOpenError",
+    "TTLCache",
+    "SingleFlight",
+    "setup_logging",
 ]
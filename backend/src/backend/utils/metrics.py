@@ -0,0 +1,63 @@
+import threading
+from collections import deque
+from typing import Deque, Dict
+
+
+class Metrics:
+    """In-process counters, gauges and latency samples exposed on /metrics."""
+
+    def __init__(self, window: int = 1024):
+        self._lock = threading.Lock()
+        self._window = window
+        self._counters: Dict[str, int] = {}
+        self._gauges: Dict[str, float] = {}
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    def incr(self, name: str, value: int = 1) -> None:
+        """Increment a counter."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set a gauge to its current value."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Record a latency sample, keeping only the most recent window."""
+        with self._lock:
+            samples = self._latencies.get(name)
+            if samples is None:
+                samples = self._latencies[name] = deque(maxlen=self._window)
+            samples.append(seconds)
+
+    def snapshot(self) -> dict:
+        """Return a JSON-serializable view of all metrics."""
+        with self._lock:
+            counters = dict(self._counters)
+            gauges = dict(self._gauges)
+            latencies = {name: sorted(samples) for name, samples in self._latencies.items()}
+
+        def percentile(values: list, pct: float) -> float:
+            index = min(len(values) - 1, int(round(pct * (len(values) - 1))))
+            return values[index]
+
+        return {
+            "counters": counters,
+            "gauges": gauges,
+            "latencies": {
+                name: {
+                    "count": len(values),
+                    "p50": percentile(values, 0.50),
+                    "p95": percentile(values, 0.95),
+                    "p99": percentile(values, 0.99),
+                    "max": values[-1],
+                }
+                for name, values in latencies.items()
+                if values
+            },
+        }
+
+
+# Global metrics registry
+metrics = Metrics()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Backfill or rebuild image embeddings in Qdrant.
+
+Scans the images table in id order, finds images without a vector and embeds
+them from their small rendition. Progress is checkpointed after every batch so
+an interrupted run resumes where it stopped. A batch only counts as done once
+every image in it was embedded or failed for good: while Replicate is
+unavailable the batch is retried with growing waits, and after --max-retries
+the run exits non-zero with the checkpoint still before that batch. Each mode
+and embedding version has its own default checkpoint file. Without --version
+the run fills the version the alias currently points at, with its model.
+
+    python src/backfill.py                  # embed images missing from Qdrant
+    python src/backfill.py --reindex        # re-embed every image
+    python src/backfill.py --sync-payloads  # also refresh payloads of existing points
+
+To migrate to a new embedding version, fill its collection with that
+version's model (see EMBEDDING_MODELS) and then run src/cutover.py:
+
+    python src/backfill.py --version v2
+"""
+
+import argparse
+import io
+import json
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image as PILImage
+from sqlmodel import Session, col, select
+
+from backend.config.database import engine
+from backend.config.minio import get_file_bytes_from_minio
+from qdrant_client.models import PointStruct
+
+from backend.config.qdrant import (
+    QdrantVectorStore,
+    create_qdrant_client,
+    ensure_collection,
+    versioned_collection,
+)
+from backend.config.settings import settings
+from backend.config.vector_store import get_vector_store
+from backend.config.replicate import EmbeddingUnavailableError, generate_embeddings
+from backend.models.models import Image, ImageAlbum
+from backend.services.image_service import image_payload
+
+
+class RateLimiter:
+    """Token bucket shared by all workers."""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def load_checkpoint(path: Path) -> Optional[uuid.UUID]:
+    if not path.exists():
+        return None
+    data = json.loads(path.read_text())
+    return uuid.UUID(data["last_id"]) if data.get("last_id") else None
+
+
+def save_checkpoint(path: Path, last_id: uuid.UUID, stats: dict) -> None:
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps({"last_id": str(last_id), **stats}))
+    tmp.replace(path)
+
+
+def fetch_batch(after: Optional[uuid.UUID], batch_size: int) -> List[dict]:
+    """Keyset-paginated scan ordered by id, with each image's Qdrant payload."""
+    stmt = select(Image).order_by(Image.id).limit(batch_size)
+    if after is not None:
+        stmt = stmt.where(col(Image.id) > after)
+    with Session(engine) as session:
+        images = session.exec(stmt).all()
+        album_ids: Dict[uuid.UUID, list] = {image.id: [] for image in images}
+        if images:
+            rows = session.exec(
+                select(ImageAlbum.image_id, ImageAlbum.album_id).where(
+                    col(ImageAlbum.image_id).in_(list(album_ids))
+                )
+            ).all()
+            for image_id, album_id in rows:
+                album_ids[image_id].append(album_id)
+        return [
+            {
+                "id": image.id,
+                "small_url": image.small_url,
+                "payload": image_payload(image, album_ids[image.id]),
+            }
+            for image in images
+        ]
+
+
+def default_checkpoint(reindex: bool, version: str) -> Path:
+    """One checkpoint per mode and version, so runs never resume from each other."""
+    return Path(f".backfill_checkpoint.{'reindex' if reindex else 'missing'}.{version}.json")
+
+
+def embed_one(
+    row: dict, limiter: RateLimiter, version: Optional[str] = None
+) -> Tuple[Optional[PointStruct], bool]:
+    """
+    Returns (point, retry). A missing point with retry=True means the embedding
+    service was unavailable and the image should be tried again; retry=False
+    means the image itself could not be embedded (missing file, bad image).
+    """
+    image_id = row["id"]
+    try:
+        image_bytes = get_file_bytes_from_minio(row["small_url"])
+        pil_img = PILImage.open(io.BytesIO(image_bytes)).convert("RGB")
+        limiter.acquire()
+        # Skip the local JSON cache: it would serve stale vectors on a reindex
+        # and rewriting it per image does not scale to a full backfill
+        embedding = generate_embeddings(pil_img, use_cache=False, version=version)
+        return PointStruct(id=str(image_id), vector=embedding, payload=row["payload"]), False
+    except EmbeddingUnavailableError as e:
+        print(f"Embedding unavailable for {image_id}: {e}")
+        return None, True
+    except Exception as e:
+        print(f"Backfill failed for {image_id}: {e}")
+        return None, False
+
+
+def main():
+    """Main entry point for the backfill."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--reindex", action="store_true", help="re-embed every image, not just missing ones")
+    parser.add_argument("--sync-payloads", action="store_true", help="rewrite payloads of points that already exist")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=10.0, help="max embedding calls per second")
+    parser.add_argument("--checkpoint", type=Path, help="checkpoint file (default: one per mode and target)")
+    parser.add_argument("--max-retries", type=int, default=8, help="retries of a batch while embeddings are unavailable")
+    parser.add_argument("--retry-wait", type=float, default=30.0, help="first wait before retrying a batch, doubled each time")
+    parser.add_argument("--restart", action="store_true", help="ignore any existing checkpoint")
+    parser.add_argument(
+        "--version",
+        help="fill the collection of this embedding version, with its model, instead of the live alias",
+    )
+    args = parser.parse_args()
+
+    if args.version:
+        _, dim = settings.embedding_model(args.version)
+        collection = versioned_collection(args.version)
+        ensure_collection(create_qdrant_client(), collection, dim)
+        store = QdrantVectorStore(collection)
+    else:
+        # The live version is whatever the alias points at
+        store = get_vector_store()
+        args.version = store.live_version()
+        store = store.for_version(args.version)
+
+    checkpoint = args.checkpoint or default_checkpoint(args.reindex, args.version)
+    last_id = None if args.restart else load_checkpoint(checkpoint)
+    if last_id:
+        print(f"Resuming after {last_id} ({checkpoint})")
+
+    limiter = RateLimiter(args.rate)
+    stats = {"scanned": 0, "embedded": 0, "failed": 0}
+    failed_ids: List[str] = []
+    started = time.monotonic()
+    attempts = 0
+    # Images of the current batch already written by an earlier attempt
+    done: set = set()
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        while True:
+            batch = fetch_batch(last_id, args.batch_size)
+            if not batch:
+                break
+
+            todo = [row for row in batch if row["small_url"] and str(row["id"]) not in done]
+            if not args.reindex:
+                present = store.existing_ids([str(row["id"]) for row in todo])
+                if args.sync_payloads:
+                    store.set_payloads({
+                        str(row["id"]): row["payload"] for row in todo if str(row["id"]) in present
+                    })
+                todo = [row for row in todo if str(row["id"]) not in present]
+
+            results = list(pool.map(lambda row: embed_one(row, limiter, args.version), todo))
+            points = [point for point, _ in results if point is not None]
+            if points:
+                store.upsert(points)
+                done.update(str(point.id) for point in points)
+                stats["embedded"] += len(points)
+
+            retry = sum(1 for point, should_retry in results if point is None and should_retry)
+            if retry:
+                # Do not move past images that only failed because the
+                # embedding service (or its circuit breaker) said no
+                attempts += 1
+                if attempts > args.max_retries:
+                    sys.exit(
+                        f"Embeddings still unavailable after {args.max_retries} retries; "
+                        f"rerun to resume from {checkpoint}"
+                    )
+                wait = args.retry_wait * 2 ** (attempts - 1)
+                print(f"{retry} images could not be embedded; retrying the batch in {wait:.0f}s")
+                time.sleep(wait)
+                continue
+
+            failed = [str(row["id"]) for row, (point, _) in zip(todo, results) if point is None]
+            failed_ids.extend(failed)
+            stats["scanned"] += len(batch)
+            stats["failed"] += len(failed)
+            attempts = 0
+            done.clear()
+            last_id = batch[-1]["id"]
+            save_checkpoint(checkpoint, last_id, stats)
+
+            elapsed = time.monotonic() - started
+            print(
+                f"scanned={stats['scanned']} embedded={stats['embedded']} "
+                f"failed={stats['failed']} rate={stats['scanned'] / elapsed:.1f} img/s"
+            )
+
+    checkpoint.unlink(missing_ok=True)
+    print(f"Backfill complete: {stats}")
+    if failed_ids:
+        # These images could not be embedded at all (missing file, bad image);
+        # on a reindex they keep their old vectors
+        sys.exit(f"{len(failed_ids)} images failed: {', '.join(failed_ids)}")
+
+
+if __name__ == "__main__":
+    main()
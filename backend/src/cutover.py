@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Move the Qdrant alias the app searches through to another collection version.
+
+Typical migration to a new embedding version:
+
+    1. add v2 to EMBEDDING_MODELS ("v2=owner/model:hash|<size>") and deploy
+       with QDRANT_MIGRATE_TO=v2, so new images are embedded with both models
+       and payload updates and deletes are mirrored
+    2. python src/backfill.py --version v2       # embeds older images with v2's model
+    3. python src/cutover.py images_v2            # checks coverage, swaps alias
+    4. deploy with QDRANT_MIGRATE_TO unset (and EMBEDDING_VERSION=v2)
+
+The app reads the live version from the alias, so the swap in step 3 moves
+searches and the model queries are embedded with together (within
+QDRANT_ALIAS_REFRESH_SECONDS); step 4 is cleanup and can wait. If an upload
+could not be embedded with v2, cutover reports it as missing; re-run the
+backfill (it only embeds what is missing) and cut over again. The old
+collection is kept, so rolling back is another cutover to it.
+
+    python src/cutover.py --status
+"""
+
+import argparse
+import sys
+
+from sqlmodel import Session, col, select
+
+from backend.config.database import engine
+from backend.config.qdrant import (
+    QdrantVectorStore,
+    alias_target,
+    create_qdrant_client,
+    swap_alias,
+)
+from backend.config.settings import settings
+from backend.models.models import Image
+
+
+def missing_points(store: QdrantVectorStore, batch_size: int = 1000) -> int:
+    """Count embeddable images (those with a small rendition) without a point."""
+    missing = 0
+    last_id = None
+    with Session(engine) as session:
+        while True:
+            stmt = (
+                select(Image.id)
+                .where(Image.small_url.is_not(None))
+                .order_by(Image.id)
+                .limit(batch_size)
+            )
+            if last_id is not None:
+                stmt = stmt.where(col(Image.id) > last_id)
+            ids = session.exec(stmt).all()
+            if not ids:
+                return missing
+            present = store.existing_ids([str(image_id) for image_id in ids])
+            missing += len(ids) - len(present)
+            last_id = ids[-1]
+
+
+def main():
+    """Main entry point for the cutover."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("collection", nargs="?", help="collection the alias should point at")
+    parser.add_argument("--status", action="store_true", help="show where the alias points and exit")
+    parser.add_argument("--force", action="store_true", help="swap even if images are missing from the collection")
+    args = parser.parse_args()
+
+    client = create_qdrant_client()
+    alias = settings.qdrant_alias
+    current = alias_target(client, alias)
+    print(f"Alias {alias} -> {current}")
+    if args.status or not args.collection:
+        return
+
+    if args.collection == current:
+        print("Nothing to do")
+        return
+    if not client.collection_exists(collection_name=args.collection):
+        sys.exit(f"Collection {args.collection} does not exist")
+
+    missing = missing_points(QdrantVectorStore(args.collection))
+    if missing and not args.force:
+        sys.exit(f"{missing} images have no point in {args.collection}; run the backfill first or pass --force")
+
+    swap_alias(client, alias, args.collection)
+    print(f"Alias {alias} -> {args.collection} (was {current})")
+
+
+if __name__ == "__main__":
+    main()
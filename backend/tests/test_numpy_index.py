@@ -0,0 +1,222 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from qdrant_client.models import (
+    FieldCondition,
+    Filter,
+    HasIdCondition,
+    MatchAny,
+    MatchExcept,
+    MatchValue,
+    PointStruct,
+)
+
+from backend.config.numpy_index import NumpyVectorStore
+
+DIM = 4
+
+
+def point(point_id: str, vector: list, **payload) -> PointStruct:
+    return PointStruct(id=point_id, vector=vector, payload=payload)
+
+
+def unit(index: int) -> list:
+    vector = [0.0] * DIM
+    vector[index] = 1.0
+    return vector
+
+
+@pytest.fixture
+def store(tmp_path):
+    return NumpyVectorStore(str(tmp_path), dim=DIM)
+
+
+@pytest.fixture
+def filled(store):
+    store.upsert([
+        point("a", [1.0, 0.0, 0.0, 0.0], privacy="public", album_ids=["x"]),
+        point("b", [0.9, 0.1, 0.0, 0.0], privacy="private", album_ids=["x", "y"]),
+        point("c", [0.0, 1.0, 0.0, 0.0], privacy="public", album_ids=[]),
+        point("d", [0.7, 0.7, 0.0, 0.0], privacy="public", album_ids=["y"]),
+    ])
+    return store
+
+
+def ids(results) -> list:
+    return [result.id for result in results]
+
+
+def test_search_orders_by_cosine_similarity(filled):
+    results = filled.search([2.0, 0.0, 0.0, 0.0], top_k=3)
+    assert ids(results) == ["a", "b", "d"]
+    assert results[0].score == pytest.approx(1.0)
+    assert results[0].payload["privacy"] == "public"
+
+
+def test_search_score_threshold_and_top_k(filled):
+    assert ids(filled.search(unit(0), top_k=10, score_threshold=0.8)) == ["a", "b"]
+    assert filled.search(unit(0), top_k=0) == []
+    assert filled.search(unit(3), top_k=5, score_threshold=0.5) == []
+
+
+def test_filter_match_value(filled):
+    public = Filter(must=[FieldCondition(key="privacy", match=MatchValue(value="public"))])
+    assert ids(filled.search(unit(0), top_k=10, query_filter=public)) == ["a", "d", "c"]
+
+
+def test_filter_array_fields_match_any_element(filled):
+    in_y = Filter(must=[FieldCondition(key="album_ids", match=MatchAny(any=["y"]))])
+    assert ids(filled.search(unit(0), top_k=10, query_filter=in_y)) == ["b", "d"]
+
+
+def test_filter_must_not_should_and_except(filled):
+    query = Filter(
+        must_not=[HasIdCondition(has_id=["a"])],
+        should=[
+            FieldCondition(key="privacy", match=MatchValue(value="private")),
+            FieldCondition(key="album_ids", match=MatchAny(any=["y"])),
+        ],
+    )
+    assert ids(filled.search(unit(0), top_k=10, query_filter=query)) == ["b", "d"]
+
+    not_private = Filter(must=[FieldCondition(key="privacy", match=MatchExcept(**{"except": ["private"]}))])
+    assert "b" not in ids(filled.search(unit(0), top_k=10, query_filter=not_private))
+
+
+def test_recommend_excludes_the_source_point(filled):
+    assert ids(filled.recommend("a", top_k=2)) == ["b", "d"]
+    with pytest.raises(KeyError):
+        filled.recommend("missing", top_k=2)
+
+
+def test_upsert_replaces_vector_and_payload(filled):
+    filled.upsert([point("c", unit(0), privacy="private")])
+    results = filled.search(unit(0), top_k=1, score_threshold=0.99)
+    assert {result.id for result in filled.search(unit(0), top_k=2)} == {"a", "c"}
+    assert filled.existing_ids(["c"]) == {"c"}
+    assert results[0].score == pytest.approx(1.0)
+
+
+def test_set_payload_updates_filters(filled):
+    filled.set_payload("a", {"privacy": "private"})
+    public = Filter(must=[FieldCondition(key="privacy", match=MatchValue(value="public"))])
+    assert "a" not in ids(filled.search(unit(0), top_k=10, query_filter=public))
+    with pytest.raises(KeyError):
+        filled.set_payload("missing", {})
+
+
+def test_set_payloads_writes_one_batch_and_skips_unknown_ids(tmp_path):
+    store = NumpyVectorStore(str(tmp_path), dim=DIM)
+    store.upsert([point("a", unit(0)), point("b", unit(1))])
+    store.set_payloads({"a": {"privacy": "private"}, "b": {"privacy": "public"}, "missing": {}})
+
+    assert len((tmp_path / "index.log").read_text().splitlines()) == 5  # header + 2 puts + 2 payloads
+    reopened = NumpyVectorStore(str(tmp_path), dim=DIM)
+    assert reopened.search(unit(0), top_k=1)[0].payload == {"privacy": "private"}
+    assert reopened.existing_ids(["missing"]) == set()
+
+
+def test_delete_tombstones_rows(tmp_path):
+    store = NumpyVectorStore(str(tmp_path), dim=DIM, compact_ratio=0.9)
+    store.upsert([point(str(i), unit(i % DIM)) for i in range(8)])
+    store.delete(["0", "4", "unknown"])
+
+    assert store.existing_ids(["0", "1", "4"]) == {"1"}
+    assert "0" not in ids(store.search(unit(0), top_k=10))
+    # Tombstoned rows keep their place until compaction
+    assert len(store._ids) == 8
+    page, offset = store.scroll_ids(limit=100)
+    assert sorted(page) == ["1", "2", "3", "5", "6", "7"] and offset is None
+
+
+def test_compaction_drops_dead_rows_and_keeps_results(tmp_path):
+    store = NumpyVectorStore(str(tmp_path), dim=DIM, compact_ratio=0.3)
+    store.upsert([point(str(i), unit(i % DIM), n=i) for i in range(10)])
+    store.delete(["0", "1", "2", "3"])
+
+    assert store._ids == [str(i) for i in range(4, 10)]
+    assert ids(store.search(unit(0), top_k=10, score_threshold=0.5)) in (["4", "8"], ["8", "4"])
+    assert store.search(unit(1), top_k=1)[0].payload["n"] in (5, 9)
+
+    reopened = NumpyVectorStore(str(tmp_path), dim=DIM)
+    assert sorted(reopened.existing_ids([str(i) for i in range(10)])) == [str(i) for i in range(4, 10)]
+
+
+def test_writes_go_to_the_log_until_a_snapshot(tmp_path):
+    store = NumpyVectorStore(str(tmp_path), dim=DIM, min_snapshot_entries=5, snapshot_ratio=0)
+    store.upsert([point("a", unit(0))])
+    store.set_payload("a", {"privacy": "public"})
+    assert not (tmp_path / "index.json").exists()
+    assert len((tmp_path / "index.log").read_text().splitlines()) == 3  # header + 2 entries
+
+    store.upsert([point(str(i), unit(1)) for i in range(3)])
+    meta = json.loads((tmp_path / "index.json").read_text())
+    assert meta["generation"] == 1 and len(meta["ids"]) == 4
+    assert len((tmp_path / "index.log").read_text().splitlines()) == 1
+
+    reopened = NumpyVectorStore(str(tmp_path), dim=DIM)
+    assert reopened.search(unit(0), top_k=1)[0].payload == {"privacy": "public"}
+
+
+def test_torn_log_line_is_ignored_and_overwritten(tmp_path):
+    store = NumpyVectorStore(str(tmp_path), dim=DIM)
+    store.upsert([point("a", unit(0))])
+    with open(tmp_path / "index.log", "ab") as f:
+        f.write(b'{"op": "put", "id": "b"')
+
+    reopened = NumpyVectorStore(str(tmp_path), dim=DIM)
+    assert reopened.existing_ids(["a", "b"]) == {"a"}
+    reopened.upsert([point("c", unit(1))])
+    assert NumpyVectorStore(str(tmp_path), dim=DIM).existing_ids(["a", "b", "c"]) == {"a", "c"}
+
+
+def test_instances_sharing_a_directory_see_each_others_writes(tmp_path):
+    server = NumpyVectorStore(str(tmp_path), dim=DIM)
+    backfill = NumpyVectorStore(str(tmp_path), dim=DIM)
+    server.upsert([point(f"s{i}", unit(i % DIM)) for i in range(7)])
+    backfill.upsert([point(f"b{i}", unit(i % DIM)) for i in range(5)])
+    server.upsert([point("s7", unit(0))])
+
+    everything = [f"s{i}" for i in range(8)] + [f"b{i}" for i in range(5)]
+    assert server.existing_ids(everything) == set(everything)
+    assert backfill.existing_ids(everything) == set(everything)
+    assert len(NumpyVectorStore(str(tmp_path), dim=DIM).existing_ids(everything)) == 13
+
+
+def test_instances_reload_after_another_compacts(tmp_path):
+    first = NumpyVectorStore(str(tmp_path), dim=DIM, compact_ratio=0.3)
+    second = NumpyVectorStore(str(tmp_path), dim=DIM)
+    first.upsert([point(str(i), unit(i % DIM)) for i in range(6)])
+    assert len(second.existing_ids([str(i) for i in range(6)])) == 6
+
+    first.delete(["0", "1", "2"])
+    results = second.search(unit(3), top_k=1)
+    assert ids(results) == ["3"]
+    assert np.allclose(second._matrix[second._rows["3"]], unit(3))
+
+
+def test_searches_from_other_threads_run_while_one_is_reading(filled):
+    with filled._locked(exclusive=False), ThreadPoolExecutor(max_workers=2) as pool:
+        futures = [pool.submit(filled.search, unit(0), top_k=1) for _ in range(2)]
+        assert [ids(future.result(timeout=5)) for future in futures] == [["a"], ["a"]]
+
+
+def test_writer_waits_for_readers_and_others_see_its_write(tmp_path):
+    store = NumpyVectorStore(str(tmp_path), dim=DIM)
+    other = NumpyVectorStore(str(tmp_path), dim=DIM)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        with store._locked(exclusive=False):
+            write = pool.submit(store.upsert, [point("a", unit(0))])
+            assert not write.done()
+        write.result(timeout=5)
+    assert store.existing_ids(["a"]) == {"a"}
+    assert other.existing_ids(["a"]) == {"a"}
+
+
+def test_dimension_mismatch_is_rejected(tmp_path):
+    store = NumpyVectorStore(str(tmp_path), dim=DIM, min_snapshot_entries=1, snapshot_ratio=0)
+    store.upsert([point("a", unit(0))])
+    with pytest.raises(ValueError):
+        NumpyVectorStore(str(tmp_path), dim=DIM + 1)
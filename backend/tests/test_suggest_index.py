@@ -0,0 +1,72 @@
+import random
+
+from backend.services.suggest_service import TOP_K, PrefixIndex
+
+
+def texts(results) -> list:
+    return [result.text for result in results]
+
+
+def test_short_prefix_ranks_every_match():
+    index = PrefixIndex()
+    index.load(
+        [("image", f"a{i}", f"sa {i:04d}", 0, True) for i in range(3000)]
+        + [("image", "popular", "sz popular", 10**6, True)]
+    )
+    assert texts(index.search("s", 5, include_private=False))[0] == "sz popular"
+
+
+def test_private_entries_only_for_signed_in_users():
+    index = PrefixIndex()
+    index.load([("image", "1", "sunset", 5, False), ("image", "2", "sunrise", 1, True)])
+    assert texts(index.search("sun", 5, include_private=False)) == ["sunrise"]
+    assert texts(index.search("sun", 5, include_private=True)) == ["sunset", "sunrise"]
+
+
+def test_added_weight_moves_an_entry_into_the_top_list():
+    index = PrefixIndex()
+    index.load([("image", str(i), f"beach {i:03d}", 10, True) for i in range(100)])
+    assert "beach 099" not in texts(index.search("b", 10, include_private=True))
+
+    index.add_weight("image", "99", 5)
+    assert texts(index.search("b", 10, include_private=True))[0] == "beach 099"
+    index.add_weight("image", "99", -15)
+    assert "beach 099" not in texts(index.search("b", 25, include_private=True))
+
+
+def test_top_lists_stay_exact_through_changes():
+    rng = random.Random(7)
+    words = ["sun", "sea", "sand", "stone", "sky", "snow", "moon"]
+    index = PrefixIndex()
+    entries = {}
+
+    def title():
+        return " ".join(rng.sample(words, 2)) + f" {rng.randrange(1000)}"
+
+    for i in range(200):
+        entries[str(i)] = [title(), rng.randrange(50), rng.random() < 0.8]
+    index.load([("image", id, text, weight, public) for id, (text, weight, public) in entries.items()])
+
+    for step in range(600):
+        id = str(rng.randrange(260))
+        action = rng.random()
+        if action < 0.3:
+            entries[id] = [title(), rng.randrange(50), rng.random() < 0.8]
+            index.upsert("image", id, *entries[id])
+        elif action < 0.45 and id in entries:
+            del entries[id]
+            index.remove("image", id)
+        elif id in entries:
+            amount = rng.randrange(-20, 40)
+            entries[id][1] += amount
+            index.add_weight("image", id, amount)
+
+        prefix = rng.choice(["s", "su", "sa", "sto", "m", "sky", "sn"])
+        include_private = rng.random() < 0.5
+        expected = sorted(
+            (-weight, text, "image", id)
+            for id, (text, weight, public) in entries.items()
+            if (public or include_private)
+            and any(word.startswith(prefix) for word in text.split())
+        )
+        assert texts(index.search(prefix, TOP_K, include_private)) == [item[1] for item in expected[:TOP_K]]
@@ -216,7 +216,7 @@ export default function LightboxPage() {
                                 )}
                                 {image.url && (
                                     <a
-                                        href={getImageUrlFromDbUrl(image.url)}
+                                        href={getImageUrlFromDbUrl(image.url) + "?download=1"}
                                         target="_blank"
                                         rel="noopener noreferrer"
                                         className="block text-blue-600 hover:text-blue-800 underline"